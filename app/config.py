@@ -11,15 +11,52 @@ class Settings:
     # Update interval in seconds (5 minutes)
     UPDATE_INTERVAL = 300
     
+    # Backoff after failed updates: capped exponential delay plus random jitter
+    MAX_UPDATE_BACKOFF = 600
+    UPDATE_BACKOFF_JITTER = 5
+    
+    # Pause after repeated failures trigger a cache clear
+    ERROR_COOLDOWN = UPDATE_INTERVAL * 4
+    
     # API endpoints
     COINGECKO_API_BASE = "https://api.coingecko.com/api/v3"
     COINGECKO_SOLANA_ECOSYSTEM_URL = "https://www.coingecko.com/en/categories/solana-ecosystem"
     
+    # Outbound HTTP - connections kept in the shared session's pool
+    HTTP_POOL_SIZE = 50
+    HTTP_POOL_PER_HOST = 20
+    
     # Rate limiting
     REQUEST_DELAY = 1  # seconds between requests
+    HOLDER_FETCH_CONCURRENCY = 10  # parallel BirdEye holder lookups per request
+    
+    # Holder distributions change slowly - serve /tokens/{mint}/holders from memory for this long
+    HOLDERS_CACHE_TTL = 60
+    HOLDERS_CACHE_MAX_ENTRIES = 1000
+    
+    # CORS - comma-separated list of origins allowed to call the API from a browser
+    ALLOWED_ORIGINS = [
+        origin.strip()
+        for origin in os.getenv(
+            "ALLOWED_ORIGINS",
+            "https://top100tokens.fly.dev,http://localhost:8000,http://127.0.0.1:8000"
+        ).split(",")
+        if origin.strip()
+    ]
+    
+    # Shared token cache (Redis). Leave unset to keep the in-process cache only
+    REDIS_URL = os.getenv("REDIS_URL")
+    
+    # Run the update loop inside the API process. Defaults to off when Redis is configured,
+    # in which case `python -m app.worker` publishes updates and API workers only read
+    RUN_UPDATER_IN_APP = os.getenv("RUN_UPDATER_IN_APP", "false" if REDIS_URL else "true").lower() == "true"
+    
+    # Keep-alive comment interval for /tokens/stream (also how often it polls Redis for updates)
+    STREAM_PING_INTERVAL = 15
     
     # Webhook settings
     MAX_WEBHOOK_RETRIES = 3
     WEBHOOK_TIMEOUT = 30
+    WEBHOOK_CONCURRENCY = 20  # deliveries in flight at once during a broadcast
 
 settings = Settings()
\ No newline at end of file
@@ -1,165 +1,524 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException, Query
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import asyncio
+import gzip
+import hashlib
 import logging
-import json
 import os
-from typing import List, Optional
+import random
+import time
+import numpy as np
+import orjson
+import jinja2
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.config import settings
 from app.models.schemas import TokenData, WebhookResponse, WebhookPayload
 from app.services.data_parser import DataParser
 from app.webhooks.handlers import webhook_manager
+from app.utils.helpers import add_holder_display_fields, create_http_session, format_number, format_price, format_contract_address
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Use uvloop's libuv-based event loop where available (not on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    logger.info("uvloop not installed, using the default asyncio event loop")
+
 
 # Global variables
 token_cache: List[TokenData] = []
-last_update: Optional[datetime] = None
+token_cache_dicts: List[Dict[str, Any]] = []  # JSON-ready dumps of token_cache, built once per update
+token_cache_json: bytes = b""  # /tokens/json body, serialized once per update
+token_cache_json_gzip: bytes = b""  # gzip of token_cache_json, compressed once per update
+token_cache_etag: str = ""
+token_rows_html: bytes = b""  # /tokens/rows body, rendered once per update
+webhook_payload_json: bytes = b""  # /tokens/webhook-payload body, serialized once per update
+total_market_cap: float = 0.0  # aggregates computed once per update
+total_volume_24h: float = 0.0
+last_update: Optional[float] = None  # time.time() of the last successful update
 update_task: Optional[asyncio.Task] = None
+broadcast_task: Optional[asyncio.Task] = None
+holders_cache: Dict[Tuple[str, int], Tuple[float, bytes, str]] = {}  # (mint, limit) -> (expires_at, body, etag)
+first_update_done = asyncio.Event()
+tokens_updated = asyncio.Event()  # set (then replaced) each time a new snapshot is published
 DATA_FILE = "tokens_data.json"
+UI_FILE = "static/index.html"
+
+# Shared cache - lets every worker serve the same snapshot; token_cache is the fallback
+LAST_UPDATE_KEY = "tokens:last_update"
+TOKENS_JSON_KEY = "tokens:json"
+TOKENS_JSON_GZIP_KEY = "tokens:json:gzip"
+TOKENS_ETAG_KEY = "tokens:etag"
+TOKENS_META_KEY = "tokens:meta"  # the tokens document without the token list, for cheap status reads
+TOKENS_ROWS_KEY = "tokens:rows"
+WEBHOOK_PAYLOAD_KEY = "tokens:webhook_payload"
+WEBHOOKS_KEY = "webhooks:registered"
+redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=False) if settings.REDIS_URL else None
+
+# Tokens table rows, compiled once and rendered once per update
+templates = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=True
+)
+templates.filters.update(number=format_number, price=format_price, contract_address=format_contract_address)
+token_rows_template = templates.get_template("token_rows.html")
 
-async def update_token_data():
+async def update_token_data(parser: DataParser):
     """Background task to update token data periodically with enhanced error handling"""
-    global token_cache, last_update
+    global token_cache, token_cache_json, token_cache_json_gzip, token_cache_etag, token_rows_html, last_update, broadcast_task
+    global webhook_payload_json
+    global token_cache_dicts, total_market_cap, total_volume_24h, tokens_updated
     
-    parser = DataParser()
     consecutive_errors = 0
     max_consecutive_errors = 3
+    last_payload_hash: Optional[str] = None
+    cooldown_until = 0.0
+    first_cycle = True  # may start from a still-valid on-disk parser cache instead of a full resolution
     
     while True:
+        served_from_cache = False
         try:
-            logger.info("🔄 Starting token data update...")
+            # Cooling down after repeated failures - don't hammer the upstream
+            remaining = cooldown_until - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(min(30, remaining))
+                continue
+            
+            logger.debug("🔄 Starting token data update...")
             
-            # Get fresh token data with force refresh to bypass cache
-            tokens = await parser.get_top_tokens(limit=100, force_refresh=True)
+            # Get fresh token data with force refresh to bypass cache - except on the first cycle, where a
+            # valid parser cache gets the app serving right away and the real refresh follows immediately
+            cached_at = parser.cache.get('timestamp')
+            tokens = await parser.get_top_tokens(limit=100, force_refresh=not first_cycle)
+            served_from_cache = first_cycle and bool(tokens) and parser.cache.get('timestamp') == cached_at
+            first_cycle = False
             
             if tokens:
                 # Update global cache
                 token_cache = tokens
-                last_update = datetime.now()
+                last_update = time.time()
+                now_iso = datetime.fromtimestamp(last_update).isoformat(timespec="seconds")
                 consecutive_errors = 0  # Reset error counter on success
                 
-                # Log update statistics
-                tokens_with_mint = sum(1 for token in tokens if token.mint_address)
-                total_market_cap = sum(token.market_cap for token in tokens)
+                # Dump and serialize once; the file, Redis, endpoints and webhooks all share the result
+                # Totals come from the parser's cached float64 columns for this token list
+                tokens_data = build_tokens_data(tokens, now_iso, parser.calculate_totals(tokens))
+                token_cache_dicts = tokens_data["tokens"]
+                total_market_cap = tokens_data["total_market_cap"]
+                total_volume_24h = tokens_data["total_volume_24h"]
+                tokens_list_json = orjson.dumps(tokens_data["tokens"])
+                token_cache_json = orjson.dumps(tokens_data)
+                token_cache_json_gzip = gzip.compress(token_cache_json, 6)
+                token_cache_etag = make_etag(token_cache_json)
+                token_rows_html = token_rows_template.render(tokens=tokens).encode()
+                webhook_payload_json = orjson.dumps(build_webhook_payload(tokens_data))
+                await publish_tokens({
+                    LAST_UPDATE_KEY: now_iso,
+                    TOKENS_JSON_KEY: token_cache_json,
+                    TOKENS_JSON_GZIP_KEY: token_cache_json_gzip,
+                    TOKENS_ETAG_KEY: token_cache_etag,
+                    TOKENS_META_KEY: orjson.dumps({key: value for key, value in tokens_data.items() if key != "tokens"}),
+                    TOKENS_ROWS_KEY: token_rows_html,
+                    WEBHOOK_PAYLOAD_KEY: webhook_payload_json
+                })
                 
-                logger.info(f"✅ Token data updated successfully. "
-                          f"{len(tokens)} tokens total, {tokens_with_mint} with mint addresses, "
-                          f"${total_market_cap:,.0f} total market cap")
+                # Wake /tokens/stream subscribers
+                tokens_updated.set()
+                tokens_updated = asyncio.Event()
                 
-                # Save to local JSON file
-                try:
-                    await save_tokens_to_json(tokens)
-                    logger.info("💾 Token data saved to JSON file")
-                except Exception as e:
-                    logger.error(f"❌ Failed to save tokens to JSON: {str(e)}")
+                # Log update statistics (only computed when INFO is enabled)
+                if logger.isEnabledFor(logging.INFO):
+                    tokens_with_mint = sum(1 for token in tokens if token.mint_address)
+                    logger.info("✅ Token data updated successfully. "
+                                "%d tokens total, %d with mint addresses, $%s total market cap",
+                                len(tokens), tokens_with_mint, f"{total_market_cap:,.0f}")
                 
-                # Broadcast to webhooks
-                try:
-                    await webhook_manager.broadcast_update(tokens, settings.UPDATE_INTERVAL)
-                    logger.info("🌐 Webhook broadcast completed")
-                except Exception as e:
-                    logger.error(f"❌ Webhook broadcast failed: {str(e)}")
+                # Skip the file write and webhook fan-out when upstream data hasn't changed
+                payload_hash = hashlib.blake2b(tokens_list_json, digest_size=8).hexdigest()
+                if payload_hash == last_payload_hash:
+                    logger.info("⏭️ Token data unchanged, skipping save and webhook broadcast")
+                else:
+                    last_payload_hash = payload_hash
+                    
+                    # Save to local JSON file
+                    try:
+                        await save_tokens_to_json(token_cache_json)
+                    except Exception as e:
+                        logger.error("❌ Failed to save tokens to JSON: %s", e)
+                    
+                    # Broadcast to webhooks in the background so slow subscribers don't stall the loop
+                    broadcast_task = asyncio.create_task(broadcast_tokens(tokens_data, tokens_list_json))
                     
             else:
                 consecutive_errors += 1
-                logger.warning(f"⚠️ No tokens fetched in update cycle (error {consecutive_errors}/{max_consecutive_errors})")
+                logger.warning("⚠️ No tokens fetched in update cycle (error %d/%d)", consecutive_errors, max_consecutive_errors)
                 
                 if consecutive_errors >= max_consecutive_errors:
-                    logger.error("🚨 Too many consecutive errors, attempting to clear cache and retry...")
-                    parser.clear_cache()
+                    logger.error("🚨 Too many consecutive errors, clearing cache and cooling down for %ss...", settings.ERROR_COOLDOWN)
+                    await asyncio.to_thread(parser.clear_cache)
                     consecutive_errors = 0
+                    cooldown_until = time.monotonic() + settings.ERROR_COOLDOWN
                 
         except asyncio.CancelledError:
             logger.info("🛑 Update task cancelled")
             break
         except Exception as e:
             consecutive_errors += 1
-            logger.error(f"❌ Error in update cycle: {str(e)}")
+            logger.error("❌ Error in update cycle: %s", e)
             
             if consecutive_errors >= max_consecutive_errors:
-                logger.error("🚨 Too many consecutive errors, attempting to clear cache and retry...")
-                parser.clear_cache()
+                logger.error("🚨 Too many consecutive errors, clearing cache and cooling down for %ss...", settings.ERROR_COOLDOWN)
+                await asyncio.to_thread(parser.clear_cache)
                 consecutive_errors = 0
+                cooldown_until = time.monotonic() + settings.ERROR_COOLDOWN
             
-            logger.info("🔄 Retrying after error...")
+            logger.debug("🔄 Retrying after error...")
         
-        # Wait for next update
-        logger.info(f"⏰ Waiting {settings.UPDATE_INTERVAL} seconds until next update...")
-        await asyncio.sleep(settings.UPDATE_INTERVAL)
+        # Lets startup proceed once the first fetch attempt has finished
+        first_update_done.set()
         
-async def save_tokens_to_json(tokens: List[TokenData]):
-    """Save token data to local JSON file"""
+        # Wait for next update, backing off with jitter while the upstream keeps failing
+        if consecutive_errors == 0 and served_from_cache:
+            sleep_for = 0  # startup snapshot came from the parser cache - refresh it now
+        elif consecutive_errors == 0:
+            sleep_for = settings.UPDATE_INTERVAL
+        else:
+            sleep_for = min(settings.UPDATE_INTERVAL * (2 ** consecutive_errors), settings.MAX_UPDATE_BACKOFF)
+            sleep_for += random.uniform(0, settings.UPDATE_BACKOFF_JITTER)
+        logger.debug("⏰ Waiting %.0f seconds until next update...", sleep_for)
+        await asyncio.sleep(sleep_for)
+        
+async def broadcast_tokens(tokens_data: Dict[str, Any], tokens_json: Optional[bytes] = None):
+    """Broadcast tokens to webhooks. Runs as a background task; each delivery is bounded by WEBHOOK_TIMEOUT,
+    so a slow subscriber only delays its own delivery and never cancels the others"""
     try:
-        data = {
-            "last_updated": datetime.now().isoformat(),
-            "total_tokens": len(tokens),
-            "total_market_cap": sum(token.market_cap for token in tokens),
-            "total_volume_24h": sum(token.volume_24h for token in tokens),
-            "tokens": [token.model_dump() for token in tokens]
+        await sync_registered_webhooks()
+        totals = {
+            "total_market_cap": tokens_data["total_market_cap"],
+            "total_volume_24h": tokens_data["total_volume_24h"]
         }
+        await webhook_manager.broadcast_update(tokens_data["tokens"], settings.UPDATE_INTERVAL, totals, tokens_json)
+        logger.debug("🌐 Webhook broadcast completed")
+    except Exception as e:
+        logger.error("❌ Webhook broadcast failed: %s", e)
+
+async def sync_registered_webhooks():
+    """Load webhook URLs registered through any API worker from Redis"""
+    if redis_client is None:
+        return
+    
+    try:
+        urls = await redis_client.smembers(WEBHOOKS_KEY)
+        webhook_manager.registered_webhooks = {url.decode() for url in urls}
+    except RedisError as e:
+        logger.warning("Redis unavailable, using local webhook list: %s", e)
+
+async def register_webhook_url(url: str) -> bool:
+    """Register a webhook URL in Redis (shared with the updater), falling back to the local manager"""
+    if redis_client is not None:
+        try:
+            return bool(await redis_client.sadd(WEBHOOKS_KEY, url))
+        except RedisError as e:
+            logger.warning("Redis unavailable, registering webhook locally: %s", e)
+    return webhook_manager.register_webhook(url)
+
+async def unregister_webhook_url(url: str) -> bool:
+    """Remove a webhook URL from Redis, falling back to the local manager"""
+    if redis_client is not None:
+        try:
+            return bool(await redis_client.srem(WEBHOOKS_KEY, url))
+        except RedisError as e:
+            logger.warning("Redis unavailable, unregistering webhook locally: %s", e)
+    return webhook_manager.unregister_webhook(url)
+
+async def list_webhook_urls() -> List[str]:
+    """Get registered webhook URLs from Redis, falling back to the local manager"""
+    await sync_registered_webhooks()
+    return webhook_manager.get_registered_webhooks()
+
+async def publish_tokens(snapshot: Dict[str, Any]):
+    """Publish the serialized token snapshot (Redis key -> value) so all workers share one copy"""
+    if redis_client is None:
+        return
+    
+    try:
+        # No expiry: during an upstream outage workers keep serving the last good snapshot,
+        # and its last_updated shows how stale it is
+        async with redis_client.pipeline(transaction=True) as pipe:
+            for key, value in snapshot.items():
+                pipe.set(key, value)
+            await pipe.execute()
+    except RedisError as e:
+        logger.error("Error publishing tokens to Redis: %s", e)
+
+async def get_last_update() -> Optional[datetime]:
+    """Get last update time from Redis, falling back to the local value"""
+    if redis_client is not None:
+        try:
+            raw = await redis_client.get(LAST_UPDATE_KEY)
+            if raw:
+                return datetime.fromisoformat(raw.decode())
+        except RedisError as e:
+            logger.warning("Redis unavailable, using local last_update: %s", e)
+    return datetime.fromtimestamp(last_update) if last_update else None
+
+async def get_token_snapshot() -> Dict[str, Any]:
+    """Get the cached tokens document (see build_tokens_data) from Redis, falling back to the local cache.
+    Empty dict when no data has been fetched yet"""
+    if redis_client is not None:
+        try:
+            raw = await redis_client.get(TOKENS_JSON_KEY)
+            if raw:
+                return orjson.loads(raw)
+        except RedisError as e:
+            logger.warning("Redis unavailable, using local token cache: %s", e)
+    
+    if not token_cache_dicts:
+        return {}
+    return {
+        "last_updated": datetime.fromtimestamp(last_update).isoformat(timespec="seconds"),
+        "total_tokens": len(token_cache),
+        "total_market_cap": total_market_cap,
+        "total_volume_24h": total_volume_24h,
+        "tokens": token_cache_dicts
+    }
+
+async def get_token_meta() -> Dict[str, Any]:
+    """Get last_updated / total_tokens / totals of the current snapshot without loading the token list.
+    Empty dict when no data has been fetched yet"""
+    if redis_client is not None:
+        try:
+            raw = await redis_client.get(TOKENS_META_KEY)
+            if raw:
+                return orjson.loads(raw)
+        except RedisError as e:
+            logger.warning("Redis unavailable, using local token metadata: %s", e)
+    
+    if not token_cache_dicts:
+        return {}
+    return {
+        "last_updated": datetime.fromtimestamp(last_update).isoformat(timespec="seconds"),
+        "total_tokens": len(token_cache),
+        "total_market_cap": total_market_cap,
+        "total_volume_24h": total_volume_24h
+    }
+
+async def get_tokens_json_bytes(gzipped: bool = False) -> Tuple[bytes, str, Optional[datetime]]:
+    """Get the pre-serialized /tokens/json body (or its gzip), its ETag and the snapshot's update time
+    from Redis in one round trip, falling back to the local copy"""
+    if redis_client is not None:
+        try:
+            raw, etag, updated = await redis_client.mget(
+                TOKENS_JSON_GZIP_KEY if gzipped else TOKENS_JSON_KEY, TOKENS_ETAG_KEY, LAST_UPDATE_KEY
+            )
+            if raw:
+                return (
+                    raw,
+                    etag.decode() if etag else make_etag(raw),
+                    datetime.fromisoformat(updated.decode()) if updated else None
+                )
+        except RedisError as e:
+            logger.warning("Redis unavailable, using local token JSON: %s", e)
+    updated_at = datetime.fromtimestamp(last_update) if last_update else None
+    return (token_cache_json_gzip if gzipped else token_cache_json), token_cache_etag, updated_at
+
+async def get_tokens_etag() -> str:
+    """Get the ETag of the current /tokens/json body without fetching the body itself"""
+    if redis_client is not None:
+        try:
+            etag = await redis_client.get(TOKENS_ETAG_KEY)
+            if etag:
+                return etag.decode()
+        except RedisError as e:
+            logger.warning("Redis unavailable, using local token ETag: %s", e)
+    return token_cache_etag
+
+async def stream_token_updates(last_event_id: Optional[str]):
+    """Server-sent events: the tokens JSON each time it changes, with keep-alive comments in between.
+    A new connection gets the current snapshot first; a reconnect (Last-Event-ID) only what it missed"""
+    sent_etag = last_event_id or ""
+    while True:
+        # Grab the event before checking so an update between the two isn't missed
+        updated = tokens_updated
+        etag = await get_tokens_etag()
+        if etag and etag != sent_etag:
+            raw, sent_etag, _ = await get_tokens_json_bytes()
+            yield b"id: %s\ndata: %s\n\n" % (sent_etag.encode(), raw)
         
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        try:
+            # Without a local updater (Redis mode) the timeout doubles as the poll interval
+            await asyncio.wait_for(updated.wait(), timeout=settings.STREAM_PING_INTERVAL)
+        except asyncio.TimeoutError:
+            yield b": ping\n\n"
+
+async def get_token_rows_html() -> bytes:
+    """Get the pre-rendered tokens table rows from Redis, falling back to the local copy"""
+    if redis_client is not None:
+        try:
+            raw = await redis_client.get(TOKENS_ROWS_KEY)
+            if raw:
+                return raw
+        except RedisError as e:
+            logger.warning("Redis unavailable, using local token rows: %s", e)
+    return token_rows_html
+
+async def get_webhook_payload_bytes() -> bytes:
+    """Get the pre-serialized webhook payload from Redis, falling back to the local copy"""
+    if redis_client is not None:
+        try:
+            raw = await redis_client.get(WEBHOOK_PAYLOAD_KEY)
+            if raw:
+                return raw
+        except RedisError as e:
+            logger.warning("Redis unavailable, using local webhook payload: %s", e)
+    return webhook_payload_json
+
+def make_etag(content: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+
+def cache_control_until_refresh(updated_at: Optional[datetime]) -> str:
+    """Cache-Control letting clients reuse a snapshot until the next scheduled update is due"""
+    max_age = 0
+    if updated_at:
+        max_age = max(0, int(settings.UPDATE_INTERVAL - (datetime.now() - updated_at).total_seconds()))
+    return f"public, max-age={max_age}"
+
+async def snapshot_cache_control() -> str:
+    """cache_control_until_refresh for the current snapshot"""
+    return cache_control_until_refresh(await get_last_update())
+
+def not_modified(request: Request, etag: str) -> bool:
+    """True when the client already holds the representation identified by etag"""
+    return bool(etag) and request.headers.get("if-none-match") == etag
+
+def cache_holders(key: Tuple[str, int], body: bytes, etag: str):
+    """Store a serialized holders response for HOLDERS_CACHE_TTL seconds"""
+    now = time.time()
+    if len(holders_cache) >= settings.HOLDERS_CACHE_MAX_ENTRIES:
+        # Drop expired entries first, then the oldest ones if still full
+        for stale in [k for k, (expires_at, _, _) in holders_cache.items() if expires_at <= now]:
+            del holders_cache[stale]
+        while len(holders_cache) >= settings.HOLDERS_CACHE_MAX_ENTRIES:
+            del holders_cache[next(iter(holders_cache))]
+    holders_cache[key] = (now + settings.HOLDERS_CACHE_TTL, body, etag)
+
+def build_tokens_data(tokens: List[TokenData], last_updated: Optional[str] = None,
+                      totals: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Build the tokens document served by /tokens/json and saved to DATA_FILE.
+    totals (see DataParser.calculate_totals) are computed here when not given"""
+    dumped = [token.as_dict for token in tokens]
+    
+    if totals is None:
+        # One vectorized pass for both totals
+        columns = np.fromiter(
+            ((token.market_cap, token.volume_24h) for token in tokens),
+            dtype=np.dtype((np.float64, 2)),
+            count=len(tokens)
+        )
+        total_market_cap, total_volume_24h = columns.sum(axis=0).tolist()
+        totals = {"total_market_cap": total_market_cap, "total_volume_24h": total_volume_24h}
+    
+    return {
+        "last_updated": last_updated or datetime.now().isoformat(timespec="seconds"),
+        "total_tokens": len(dumped),
+        "total_market_cap": totals["total_market_cap"],
+        "total_volume_24h": totals["total_volume_24h"],
+        "tokens": dumped
+    }
+
+def build_webhook_payload(tokens_data: Dict[str, Any]) -> Dict[str, Any]:
+    """WebhookPayload-shaped dict for a tokens document (see build_tokens_data)"""
+    return {
+        "timestamp": tokens_data["last_updated"],
+        "update_interval": settings.UPDATE_INTERVAL,
+        "total_tokens": tokens_data["total_tokens"],
+        "total_market_cap": tokens_data["total_market_cap"],
+        "total_volume_24h": tokens_data["total_volume_24h"],
+        "tokens": tokens_data["tokens"]
+    }
+
+def _write_json_sync(payload: bytes):
+    """Blocking part of save_tokens_to_json - run in a worker thread"""
+    with open(DATA_FILE, 'wb') as f:
+        f.write(payload)
+
+async def save_tokens_to_json(payload: bytes):
+    """Save serialized token data (compact JSON, same bytes as /tokens/json) to local JSON file"""
+    try:
+        # Write off the event loop
+        await asyncio.to_thread(_write_json_sync, payload)
         
-        logger.info(f"Token data saved to {DATA_FILE}")
+        logger.info("💾 Token data saved to %s", DATA_FILE)
     except Exception as e:
-        logger.error(f"Error saving tokens to JSON: {str(e)}")
+        logger.error("Error saving tokens to JSON: %s", e)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup - fetch data immediately
-    logger.info("Starting background update task...")
-    global update_task
+    # Load the UI once; /ui serves these bytes as-is
+    app.state.ui_html = Path(UI_FILE).read_bytes()
+    app.state.ui_html_gzip = gzip.compress(app.state.ui_html)
+    app.state.ui_etag = make_etag(app.state.ui_html)
     
-    # Create an immediate first fetch
-    async def initial_fetch():
-        parser = DataParser()
-        tokens = await parser.get_top_tokens(limit=100)
-        if tokens:
-            global token_cache, last_update
-            token_cache = tokens
-            last_update = datetime.now()
-            await save_tokens_to_json(tokens)
-            logger.info(f"Initial data fetch: {len(tokens)} tokens")
-    
-    # Run initial fetch
-    await initial_fetch()
+    global update_task
+    # One pooled HTTP session for CoinGecko and BirdEye, shared by the updater and the endpoints
+    app.state.http = create_http_session()
+    app.state.parser = DataParser(session=app.state.http)
     
-    # Start periodic updates
-    update_task = asyncio.create_task(update_token_data())
+    if settings.RUN_UPDATER_IN_APP:
+        # Startup - the update task fetches immediately, wait for that first cycle
+        logger.info("Starting background update task...")
+        update_task = asyncio.create_task(update_token_data(app.state.parser))
+        await first_update_done.wait()
+    else:
+        logger.info("Updates are published by app.worker, serving token data from Redis")
     
     yield
     
     # Shutdown
-    if update_task:
-        update_task.cancel()
-        try:
-            await update_task
-        except asyncio.CancelledError:
-            pass
+    for task in (update_task, broadcast_task):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     logger.info("Background task stopped")
+    
+    await app.state.parser.close()
+    await app.state.http.close()
+    await webhook_manager.close()
+    if redis_client is not None:
+        await redis_client.aclose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allows all origins
+    allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],  # Allows all methods
-    allow_headers=["*"],  # Allows all headers
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+    allow_headers=["authorization", "content-type"],
 )
+# Compress dynamic responses; pre-compressed ones (/ui, /tokens/json) and SSE pass through
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 # Mount static files directory
 os.makedirs("static", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -170,8 +529,8 @@ async def root():
         "message": "Solana Top Tokens Webhook Service",
         "version": settings.VERSION,
         "status": "running",
-        "last_update": last_update,
-        "registered_webhooks": len(webhook_manager.get_registered_webhooks()),
+        "last_update": await get_last_update(),
+        "registered_webhooks": len(await list_webhook_urls()),
         "endpoints": {
             "ui": "/ui",
             "tokens_json": "/tokens/json",
@@ -182,838 +541,27 @@ async def root():
     }
 
 @app.get("/ui", response_class=HTMLResponse)
-async def serve_ui():
+async def serve_ui(request: Request):
     """Serve a simple HTML UI to display the tokens"""
-    html_content = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Solana Top 100 Tokens</title>
-    <style>
-        * { box-sizing: border-box; }
-        body { 
-            font-family: Arial, sans-serif; 
-            margin: 0; 
-            padding: 20px; 
-            background: #f5f5f5; 
-        }
-        .container { 
-            max-width: 1600px; 
-            margin: 0 auto; 
-            background: white; 
-            padding: 20px; 
-            border-radius: 8px; 
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1); 
-        }
-        h1 { 
-            color: #333; 
-            text-align: center; 
-            margin-bottom: 30px;
-        }
-        h3 {
-            color: #333;
-            margin-bottom: 15px;
-        }
-        .status { 
-            padding: 15px; 
-            margin: 20px 0; 
-            border-radius: 5px; 
-            text-align: center;
-        }
-        .status.loading { 
-            background: #fff3cd; 
-            color: #856404; 
-            border: 1px solid #ffeaa7;
-        }
-        .status.success { 
-            background: #d1ecf1; 
-            color: #0c5460; 
-            border: 1px solid #bee5eb;
-            display: none;
-        }
-        .status.error { 
-            background: #f8d7da; 
-            color: #721c24; 
-            border: 1px solid #f5c6cb;
-            display: none;
-        }
-        .stats { 
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin: 20px 0; 
-        }
-        .stat-item { 
-            text-align: center; 
-            padding: 15px;
-            background: #f8f9fa;
-            border-radius: 5px;
-            border: 1px solid #e9ecef;
-        }
-        .stat-value { 
-            font-size: 1.2em; 
-            font-weight: bold; 
-            color: #007bff; 
-            margin-top: 5px;
-        }
-        .table-container { 
-            overflow-x: auto; 
-            margin-top: 20px;
-        }
-        table { 
-            width: 100%; 
-            border-collapse: collapse;
-            font-size: 14px;
-        }
-        th, td { 
-            padding: 12px; 
-            text-align: left; 
-            border-bottom: 1px solid #ddd; 
-        }
-        th { 
-            background: #007bff; 
-            color: white; 
-            position: sticky; 
-            top: 0; 
-            font-weight: 600;
-        }
-        tr:hover { 
-            background: #f8f9fa; 
-        }
-        .positive { 
-            color: #28a745; 
-            font-weight: bold;
-        }
-        .negative { 
-            color: #dc3545; 
-            font-weight: bold;
-        }
-        .rank { 
-            font-weight: bold; 
-            text-align: center; 
-            width: 60px;
-        }
-        .actions { 
-            display: flex;
-            gap: 10px;
-            justify-content: center;
-            margin: 20px 0;
-            flex-wrap: wrap;
-        }
-        .btn { 
-            padding: 10px 20px; 
-            background: #007bff; 
-            color: white; 
-            border: none; 
-            border-radius: 4px; 
-            cursor: pointer; 
-            text-decoration: none; 
-            display: inline-block;
-            font-size: 14px;
-        }
-        .btn:hover { 
-            background: #0056b3; 
-        }
-        .btn.refresh { 
-            background: #28a745; 
-        }
-        .btn.refresh:hover { 
-            background: #1e7e34; 
-        }
-        .btn.secondary {
-            background: #6c757d;
-        }
-        .btn.secondary:hover {
-            background: #545b62;
-        }
-        .token-symbol {
-            background: #e9ecef;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-family: monospace;
-            font-size: 12px;
-        }
-        .contract-address {
-            font-family: monospace;
-            font-size: 11px;
-            color: #666;
-            background: #f8f9fa;
-            padding: 4px 6px;
-            border-radius: 3px;
-            word-break: break-all;
-            max-width: 200px;
-            cursor: pointer;
-        }
-        .contract-address:hover {
-            background: #e9ecef;
-        }
-        .links a {
-            margin-right: 8px;
-            color: #007bff;
-            text-decoration: none;
-            font-size: 12px;
-        }
-        .links a:hover {
-            text-decoration: underline;
-        }
-        .copy-btn {
-            background: none;
-            border: none;
-            color: #6c757d;
-            cursor: pointer;
-            font-size: 12px;
-            margin-left: 5px;
-        }
-        .copy-btn:hover {
-            color: #007bff;
-        }
-        .tooltip {
-            position: relative;
-            display: inline-block;
-        }
-        .tooltip .tooltiptext {
-            visibility: hidden;
-            width: 140px;
-            background-color: #555;
-            color: #fff;
-            text-align: center;
-            border-radius: 6px;
-            padding: 5px;
-            position: absolute;
-            z-index: 1;
-            bottom: 125%;
-            left: 50%;
-            margin-left: -70px;
-            opacity: 0;
-            transition: opacity 0.3s;
-            font-size: 12px;
-        }
-        .tooltip:hover .tooltiptext {
-            visibility: visible;
-            opacity: 1;
-        }
-        
-        /* Sortable headers */
-        th[data-column] {
-            cursor: pointer;
-            user-select: none;
-            position: relative;
-            transition: background-color 0.2s ease;
-        }
-        th[data-column]:hover {
-            background: #0056b3 !important;
-        }
-        .sort-asc::after {
-            content: " ↑";
-            font-weight: bold;
-        }
-        .sort-desc::after {
-            content: " ↓";
-            font-weight: bold;
-        }
-        th[data-column]::before {
-            content: "↕";
-            opacity: 0.5;
-            margin-right: 5px;
-            font-size: 12px;
-        }
-        th.sort-asc::before,
-        th.sort-desc::before {
-            opacity: 1;
-        }
-        
-        /* Holder Section Styles */
-        .holders-section {
-            margin-top: 30px;
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 8px;
-            border: 1px solid #e9ecef;
-        }
-        .holder-stats {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-bottom: 20px;
-        }
-        .holders-container {
-            margin-top: 15px;
-        }
-        #holders-table {
-            font-size: 13px;
-        }
-        #holders-table th, #holders-table td {
-            padding: 8px 12px;
-        }
-        .wallet-address {
-            font-family: monospace;
-            font-size: 11px;
-            background: #fff;
-            padding: 4px 6px;
-            border-radius: 3px;
-            cursor: pointer;
-            border: 1px solid #dee2e6;
-        }
-        .wallet-address:hover {
-            background: #e9ecef;
-        }
-        .percentage-bar {
-            background: #e9ecef;
-            border-radius: 10px;
-            height: 8px;
-            margin-top: 4px;
-            overflow: hidden;
-        }
-        .percentage-fill {
-            background: #007bff;
-            height: 100%;
-            border-radius: 10px;
-            transition: width 0.3s ease;
-        }
-        .token-row {
-            cursor: pointer;
-        }
-        .token-row:hover {
-            background: #f0f8ff !important;
-        }
-        .holders-loading {
-            text-align: center;
-            padding: 40px;
-            color: #6c757d;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🚀 Solana Top 100 Tokens</h1>
-        
-        <div class="actions">
-            <button class="btn refresh" onclick="loadTokenData()">🔄 Refresh Data</button>
-            <a href="/tokens/download" class="btn">📥 Download JSON</a>
-            <a href="/tokens/with-holders/json" target="_blank" class="btn secondary">🔗 View JSON with Holders</a>
-            <a href="/tokens/json" target="_blank" class="btn secondary">🔗 View Raw JSON</a>
-            <a href="/" class="btn secondary">🏠 API Home</a>
-        </div>
-
-        <!-- Status Messages -->
-        <div id="status-loading" class="status loading">
-            ⏳ Loading token data...
-        </div>
-        
-        <div id="status-success" class="status success">
-            ✅ Data loaded successfully! <span id="last-updated-text"></span>
-        </div>
-        
-        <div id="status-error" class="status error">
-            ❌ Error loading data. Check console for details.
-        </div>
-
-        <!-- Statistics -->
-        <div id="stats" class="stats" style="display: none;">
-            <div class="stat-item">
-                <div>Total Tokens</div>
-                <div id="total-tokens" class="stat-value">0</div>
-            </div>
-            <div class="stat-item">
-                <div>Total Market Cap</div>
-                <div id="total-market-cap" class="stat-value">$0</div>
-            </div>
-            <div class="stat-item">
-                <div>Total 24h Volume</div>
-                <div id="total-volume" class="stat-value">$0</div>
-            </div>
-            <div class="stat-item">
-                <div>Last Updated</div>
-                <div id="last-updated" class="stat-value">-</div>
-            </div>
-        </div>
-
-        <!-- Tokens Table -->
-        <div class="table-container">
-            <table id="tokens-table">
-                <thead>
-                    <tr>
-                        <th class="rank" data-column="rank">#</th>
-                        <th data-column="name">Token</th>
-                        <th>Contract Address</th>
-                        <th data-column="price">Price</th>
-                        <th data-column="price_change_24h">24h Change</th>
-                        <th data-column="market_cap">Market Cap</th>
-                        <th data-column="volume_24h">24h Volume</th>
-                        <th>Links</th>
-                    </tr>
-                </thead>
-                <tbody id="tokens-body">
-                    <tr>
-                        <td colspan="8" style="text-align: center; padding: 40px;">
-                            No token data available. Click "Refresh Data" to load.
-                        </td>
-                    </tr>
-                </tbody>
-            </table>
-        </div>
-
-        <!-- Holders Section -->
-        <div class="holders-section" style="display: none;" id="holders-section">
-            <h3>💰 Top Token Holders - <span id="selected-token-name">Select a token</span></h3>
-            
-            <div class="holder-stats" id="holder-stats" style="display: none;">
-                <div class="stat-item">
-                    <div>Total Holders</div>
-                    <div id="total-holders" class="stat-value">0</div>
-                </div>
-                <div class="stat-item">
-                    <div>Largest Holder</div>
-                    <div id="largest-holder" class="stat-value">0</div>
-                </div>
-                <div class="stat-item">
-                    <div>Average Balance</div>
-                    <div id="avg-balance" class="stat-value">0</div>
-                </div>
-            </div>
-            
-            <div class="holders-container">
-                <div class="table-container">
-                    <table id="holders-table">
-                        <thead>
-                            <tr>
-                                <th>Rank</th>
-                                <th>Wallet Address</th>
-                                <th>Balance</th>
-                                <th>Percentage</th>
-                                <th>Actions</th>
-                            </tr>
-                        </thead>
-                        <tbody id="holders-body">
-                            <tr>
-                                <td colspan="5" style="text-align: center; padding: 20px;">
-                                    Click on a token row to view its top holders
-                                </td>
-                            </tr>
-                        </tbody>
-                    </table>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        let currentSort = { column: 'rank', direction: 'asc' };
-        let currentTokens = [];
-        let currentTokenAddress = null;
-        let currentTokenSymbol = null;
-
-        // Sorting functions
-        function sortTokens(column) {
-            const direction = currentSort.column === column && currentSort.direction === 'asc' ? 'desc' : 'asc';
-            currentSort = { column, direction };
-            
-            const sortedTokens = [...currentTokens].sort((a, b) => {
-                let aValue = a[column];
-                let bValue = b[column];
-                
-                // Handle special cases for different columns
-                switch(column) {
-                    case 'rank':
-                        aValue = a.rank || 999;
-                        bValue = b.rank || 999;
-                        break;
-                    case 'name':
-                        aValue = (a.name || '').toLowerCase();
-                        bValue = (b.name || '').toLowerCase();
-                        break;
-                    case 'symbol':
-                        aValue = (a.symbol || '').toLowerCase();
-                        bValue = (b.symbol || '').toLowerCase();
-                        break;
-                    case 'price_change_24h':
-                        aValue = a.price_change_24h || 0;
-                        bValue = b.price_change_24h || 0;
-                        break;
-                    case 'market_cap':
-                        aValue = a.market_cap || 0;
-                        bValue = b.market_cap || 0;
-                        break;
-                    case 'volume_24h':
-                        aValue = a.volume_24h || 0;
-                        bValue = b.volume_24h || 0;
-                        break;
-                    default:
-                        aValue = aValue || '';
-                        bValue = bValue || '';
-                }
-                
-                if (direction === 'asc') {
-                    return aValue > bValue ? 1 : -1;
-                } else {
-                    return aValue < bValue ? 1 : -1;
-                }
-            });
-            
-            displayTokensTable(sortedTokens);
-            updateSortIndicators(column, direction);
-        }
-
-        function updateSortIndicators(column, direction) {
-            // Remove all sort indicators
-            document.querySelectorAll('th[data-column]').forEach(th => {
-                th.classList.remove('sort-asc', 'sort-desc');
-                th.innerHTML = th.innerHTML.replace(' ↑', '').replace(' ↓', '');
-            });
-            
-            // Add indicator to current sort column
-            const header = document.querySelector(`th[data-column="${column}"]`);
-            if (header) {
-                const indicator = direction === 'asc' ? ' ↑' : ' ↓';
-                header.innerHTML += indicator;
-                header.classList.add(direction === 'asc' ? 'sort-asc' : 'sort-desc');
-            }
-        }
-
-        function setupSortableHeaders() {
-            const headers = document.querySelectorAll('#tokens-table th[data-column]');
-            headers.forEach(header => {
-                header.style.cursor = 'pointer';
-                header.title = 'Click to sort';
-                header.addEventListener('click', (e) => {
-                    e.stopPropagation();
-                    const column = header.getAttribute('data-column');
-                    sortTokens(column);
-                });
-            });
-        }
-
-        function displayTokensTable(tokens) {
-            currentTokens = tokens; // Store tokens for sorting
-            
-            const tbody = document.getElementById('tokens-body');
-            tbody.innerHTML = '';
-            
-            tokens.forEach(token => {
-                const changeClass = token.price_change_24h >= 0 ? 'positive' : 'negative';
-                const changeSymbol = token.price_change_24h >= 0 ? '↗' : '↘';
-                const changeText = token.price_change_24h ? 
-                    `${changeSymbol} ${Math.abs(token.price_change_24h).toFixed(2)}%` : 'N/A';
-                
-                const contractAddress = token.mint_address || token.contract_address;
-                const displayAddress = formatContractAddress(contractAddress);
-                
-                const row = document.createElement('tr');
-                row.className = 'token-row';
-                row.setAttribute('data-symbol', token.symbol);
-                row.setAttribute('data-address', contractAddress);
-                row.setAttribute('data-name', token.name);
-                
-                row.innerHTML = `
-                    <td class="rank">${token.rank || '?'}</td>
-                    <td>
-                        <strong>${token.name || 'Unknown Token'}</strong><br>
-                        <span class="token-symbol">${token.symbol || 'N/A'}</span>
-                    </td>
-                    <td>
-                        ${contractAddress ? `
-                            <div class="tooltip">
-                                <span class="contract-address" onclick="event.stopPropagation(); copyToClipboard('${contractAddress}')">
-                                    ${displayAddress}
-                                </span>
-                                <span class="tooltiptext">Click to copy full address</span>
-                            </div>
-                        ` : 'N/A'}
-                    </td>
-                    <td><strong>${formatPrice(token.price)}</strong></td>
-                    <td class="${changeClass}">${changeText}</td>
-                    <td>$` + formatNumber(token.market_cap) + `</td>
-                    <td>$` + formatNumber(token.volume_24h) + `</td>
-                    <td class="links">
-                        ${token.solscan_url ? `<a href="${token.solscan_url}" target="_blank" title="View on Solscan" onclick="event.stopPropagation();">Solscan</a>` : ''}
-                        ${token.coingecko_url ? `<a href="${token.coingecko_url}" target="_blank" title="View on CoinGecko" onclick="event.stopPropagation();">CoinGecko</a>` : ''}
-                        ${token.birdeye_url ? `<a href="${token.birdeye_url}" target="_blank" title="View on Birdeye" onclick="event.stopPropagation();">Birdeye</a>` : ''}
-                        ${contractAddress && contractAddress !== 'native' ? 
-                            `<a href="https://solscan.io/token/${contractAddress}" target="_blank" title="View token on Solscan" onclick="event.stopPropagation();">🔍</a>` : ''}
-                    </td>
-                `;
-                tbody.appendChild(row);
-            });
-
-            // Add click handlers to token rows
-            document.querySelectorAll('.token-row').forEach(row => {
-                row.addEventListener('click', function() {
-                    const symbol = this.getAttribute('data-symbol');
-                    const address = this.getAttribute('data-address');
-                    const name = this.getAttribute('data-name');
-                    
-                    if (address && address !== 'null') {
-                        loadTokenHolders(address, symbol, name);
-                    }
-                });
-            });
-        }
-
-        function showLoading() {
-            document.getElementById('status-loading').style.display = 'block';
-            document.getElementById('status-success').style.display = 'none';
-            document.getElementById('status-error').style.display = 'none';
-            document.getElementById('stats').style.display = 'none';
-        }
-
-        function showSuccess() {
-            document.getElementById('status-loading').style.display = 'none';
-            document.getElementById('status-success').style.display = 'block';
-            document.getElementById('status-error').style.display = 'none';
-            document.getElementById('stats').style.display = 'grid';
-        }
-
-        function showError() {
-            document.getElementById('status-loading').style.display = 'none';
-            document.getElementById('status-success').style.display = 'none';
-            document.getElementById('status-error').style.display = 'block';
-            document.getElementById('stats').style.display = 'none';
-        }
-
-        function formatNumber(num) {
-            if (num === null || num === undefined) return 'N/A';
-            if (num >= 1e9) return (num / 1e9).toFixed(2) + 'B';
-            if (num >= 1e6) return (num / 1e6).toFixed(2) + 'M';
-            if (num >= 1e3) return (num / 1e3).toFixed(2) + 'K';
-            return num.toFixed(2);
-        }
-
-        function formatPrice(price) {
-            if (price === null || price === undefined) return 'N/A';
-            if (price >= 1000) return '$' + price.toFixed(0);
-            if (price >= 1) return '$' + price.toFixed(2);
-            if (price >= 0.01) return '$' + price.toFixed(4);
-            if (price >= 0.0001) return '$' + price.toFixed(6);
-            return '$' + price.toFixed(8);
-        }
-
-        function formatDate(dateString) {
-            try {
-                return new Date(dateString).toLocaleString();
-            } catch (e) {
-                return 'Unknown';
-            }
-        }
-
-        function formatContractAddress(address) {
-            if (!address) return 'N/A';
-            if (address === 'native') return 'Native SOL';
-            if (address.length <= 16) return address;
-            return address.substring(0, 8) + '...' + address.substring(address.length - 8);
-        }
-
-        function formatWalletAddress(address) {
-            if (!address) return 'N/A';
-            return address.substring(0, 6) + '...' + address.substring(address.length - 4);
-        }
-
-        function copyToClipboard(text) {
-            navigator.clipboard.writeText(text).then(function() {
-                // Show temporary success message
-                const originalText = event.target.textContent;
-                event.target.textContent = '✓ Copied!';
-                setTimeout(() => {
-                    event.target.textContent = originalText;
-                }, 2000);
-            }).catch(function(err) {
-                console.error('Failed to copy: ', err);
-            });
-        }
-
-        async function loadTokenData() {
-            console.log('Loading token data...');
-            showLoading();
-            
-            try {
-                const response = await fetch('/tokens/json');
-                console.log('Response status:', response.status);
-                
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}`);
-                }
-                
-                const data = await response.json();
-                console.log('Data received:', data);
-                
-                // Update statistics
-                document.getElementById('total-tokens').textContent = data.total_tokens || 0;
-                document.getElementById('total-market-cap').textContent = '$' + formatNumber(data.total_market_cap);
-                document.getElementById('total-volume').textContent = '$' + formatNumber(data.total_volume_24h);
-                document.getElementById('last-updated').textContent = formatDate(data.last_updated);
-                document.getElementById('last-updated-text').textContent = formatDate(data.last_updated);
-                
-                // Update table
-                if (!data.tokens || data.tokens.length === 0) {
-                    const tbody = document.getElementById('tokens-body');
-                    tbody.innerHTML = `
-                        <tr>
-                            <td colspan="8" style="text-align: center; padding: 40px; color: #6c757d;">
-                                No token data available. The data might still be loading.
-                            </td>
-                        </tr>
-                    `;
-                } else {
-                    displayTokensTable(data.tokens);
-                    setupSortableHeaders();
-                    updateSortIndicators(currentSort.column, currentSort.direction);
-                }
-                
-                showSuccess();
-                console.log('Successfully loaded', data.tokens?.length || 0, 'tokens');
-                
-            } catch (error) {
-                console.error('Error loading token data:', error);
-                showError();
-                
-                const tbody = document.getElementById('tokens-body');
-                tbody.innerHTML = `
-                    <tr>
-                        <td colspan="8" style="text-align: center; padding: 40px; color: #dc3545;">
-                            Error loading token data: ${error.message}<br>
-                            <small>Check the browser console for details.</small>
-                        </td>
-                    </tr>
-                `;
-            }
-        }
-
-        async function loadTokenHolders(tokenAddress, symbol, name) {
-            if (!tokenAddress) {
-                console.log('No token address provided');
-                return;
-            }
-            
-            currentTokenAddress = tokenAddress;
-            currentTokenSymbol = symbol;
-            
-            console.log(`Loading holders for ${symbol} (${tokenAddress})`);
-            showHoldersLoading(name);
-            
-            try {
-                const response = await fetch(`/tokens/${tokenAddress}/holders`);
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}`);
-                }
-                
-                const data = await response.json();
-                displayHoldersData(data, symbol);
-                
-            } catch (error) {
-                console.error('Error loading holders:', error);
-                showHoldersError(error.message);
-            }
-        }
-
-        function showHoldersLoading(tokenName) {
-            const section = document.getElementById('holders-section');
-            const tokenNameSpan = document.getElementById('selected-token-name');
-            const tbody = document.getElementById('holders-body');
-            
-            section.style.display = 'block';
-            tokenNameSpan.textContent = tokenName || 'Loading...';
-            document.getElementById('holder-stats').style.display = 'none';
-            
-            tbody.innerHTML = `
-                <tr>
-                    <td colspan="5" style="text-align: center; padding: 40px;">
-                        <div style="color: #6c757d;">
-                            <div>⏳ Loading holder data...</div>
-                            <small>This may take a few seconds</small>
-                        </div>
-                    </td>
-                </tr>
-            `;
-        }
-
-        function showHoldersError(message) {
-            const tbody = document.getElementById('holders-body');
-            tbody.innerHTML = `
-                <tr>
-                    <td colspan="5" style="text-align: center; padding: 40px; color: #dc3545;">
-                        <div>❌ Error loading holder data</div>
-                        <small>${message}</small>
-                    </td>
-                </tr>
-            `;
-        }
-
-        function displayHoldersData(data, symbol) {
-            const holders = data.holders || [];
-            const stats = data.stats || {};
-            
-            // Update statistics
-            document.getElementById('total-holders').textContent = stats.total_holders || 0;
-            document.getElementById('largest-holder').textContent = formatNumber(stats.largest_balance) + ' ' + symbol;
-            document.getElementById('avg-balance').textContent = formatNumber(stats.average_balance) + ' ' + symbol;
-            document.getElementById('holder-stats').style.display = 'grid';
-            
-            // Update holders table
-            const tbody = document.getElementById('holders-body');
-            
-            if (holders.length === 0) {
-                tbody.innerHTML = `
-                    <tr>
-                        <td colspan="5" style="text-align: center; padding: 40px; color: #6c757d;">
-                            No holder data available for this token
-                        </td>
-                    </tr>
-                `;
-                return;
-            }
-            
-            tbody.innerHTML = '';
-            
-            holders.forEach((holder, index) => {
-                const rank = index + 1;
-                const balance = holder.ui_amount || 0;
-                const percentage = holder.percentage || 0;
-                
-                const row = document.createElement('tr');
-                row.innerHTML = `
-                    <td style="text-align: center; font-weight: bold;">${rank}</td>
-                    <td>
-                        <div class="tooltip">
-                            <span class="wallet-address" onclick="event.stopPropagation(); copyToClipboard('${holder.owner}')">
-                                ${formatWalletAddress(holder.owner)}
-                            </span>
-                            <span class="tooltiptext">Click to copy wallet address</span>
-                        </div>
-                    </td>
-                    <td><strong>${formatNumber(balance)} ${symbol}</strong></td>
-                    <td>
-                        <div>${percentage.toFixed(4)}%</div>
-                        <div class="percentage-bar">
-                            <div class="percentage-fill" style="width: ${Math.min(percentage * 2, 100)}%"></div>
-                        </div>
-                    </td>
-                    <td>
-                        <a href="https://solscan.io/account/${holder.owner}" target="_blank" title="View on Solscan" style="margin-right: 8px;">🔍</a>
-                        <a href="https://birdeye.so/address/${holder.owner}?chain=solana" target="_blank" title="View on BirdEye">🦅</a>
-                    </td>
-                `;
-                tbody.appendChild(row);
-            });
-        }
+    headers = {
+        "Cache-Control": "public, max-age=300, immutable",
+        "ETag": app.state.ui_etag
+    }
+    # Vary is set here only where GZipMiddleware won't add it (304s and pre-compressed bodies)
+    if not_modified(request, app.state.ui_etag):
+        return Response(status_code=304, headers={**headers, "Vary": "Accept-Encoding"})
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+        return Response(app.state.ui_html_gzip, media_type="text/html", headers=headers)
+    return Response(app.state.ui_html, media_type="text/html", headers=headers)
 
-        // Load data when page loads
-        document.addEventListener('DOMContentLoaded', function() {
-            console.log('Page loaded, starting initial data load...');
-            loadTokenData();
-            
-            // Auto-refresh every 30 seconds
-            setInterval(loadTokenData, 30000);
-        });
-    </script>
-</body>
-</html>
-    """
-    return html_content
 @app.get("/tokens/json")
-async def get_tokens_json():
+async def get_tokens_json(request: Request):
     """Get token data as JSON"""
-    if not token_cache:
+    gzipped = "gzip" in request.headers.get("accept-encoding", "")
+    raw, etag, updated_at = await get_tokens_json_bytes(gzipped)
+    if not raw:
         # Return empty data instead of error for better UI handling
         return {
             "last_updated": datetime.now().isoformat(),
@@ -1023,79 +571,103 @@ async def get_tokens_json():
             "tokens": []
         }
     
-    try:
-        # Calculate totals safely
-        total_market_cap = sum(getattr(token, 'market_cap', 0) for token in token_cache)
-        total_volume_24h = sum(getattr(token, 'volume_24h', 0) for token in token_cache)
-        
-        # Convert tokens to dict safely
-        tokens_data = []
-        for token in token_cache:
-            try:
-                if hasattr(token, 'model_dump'):
-                    tokens_data.append(token.model_dump())
-                else:
-                    # Fallback: convert to dict manually
-                    token_dict = {}
-                    for field in ['rank', 'name', 'symbol', 'mint_address', 'market_cap', 
-                                 'volume_24h', 'price', 'price_change_24h', 'solscan_url', 
-                                 'coingecko_url', 'birdeye_url']:
-                        token_dict[field] = getattr(token, field, None)
-                    tokens_data.append(token_dict)
-            except Exception as e:
-                logger.error(f"Error converting token to dict: {e}")
-                continue
-        
-        return {
-            "last_updated": last_update.isoformat() if last_update else datetime.now().isoformat(),
-            "total_tokens": len(token_cache),
-            "total_market_cap": total_market_cap,
-            "total_volume_24h": total_volume_24h,
-            "tokens": tokens_data
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in /tokens/json: {e}")
-        raise HTTPException(status_code=500, detail="Error processing token data")
+    # Already serialized by the update task - send the bytes as-is
+    headers = {"Cache-Control": cache_control_until_refresh(updated_at), "ETag": etag}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={**headers, "Vary": "Accept-Encoding"})
+    if gzipped:
+        # Compressed once per update; GZipMiddleware leaves responses with Content-Encoding alone
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return Response(raw, media_type="application/json", headers=headers)
+    
+@app.get("/tokens/stream")
+async def stream_tokens(request: Request):
+    """Push token data to the browser whenever the updater publishes a new snapshot"""
+    return StreamingResponse(
+        stream_token_updates(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/tokens/rows", response_class=HTMLResponse)
+async def get_token_rows():
+    """Get the tokens table body as pre-rendered HTML rows"""
+    html = await get_token_rows_html()
+    if not html:
+        raise HTTPException(status_code=503, detail="Token data not available yet")
     
+    return Response(html, media_type="text/html", headers={"Cache-Control": await snapshot_cache_control()})
+
 @app.get("/tokens/download")
 async def download_tokens_json():
     """Download token data as JSON file"""
+    filename = f"solana_top_tokens_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
+    
     if not os.path.exists(DATA_FILE):
-        raise HTTPException(status_code=404, detail="Data file not found")
+        # The file lives with whichever process runs the updater - serve the shared snapshot instead
+        raw, _, _ = await get_tokens_json_bytes()
+        if not raw:
+            raise HTTPException(status_code=404, detail="Data file not found")
+        return Response(
+            raw,
+            media_type='application/json',
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
     
     return FileResponse(
         DATA_FILE,
         media_type='application/json',
-        filename=f"solana_top_tokens_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
+        filename=filename
     )
 
 @app.get("/tokens", response_model=List[TokenData])
 async def get_tokens(limit: int = Query(100, le=200, ge=1)):
     """Get current top tokens"""
-    if not token_cache:
+    tokens = (await get_token_snapshot()).get("tokens")
+    if not tokens:
         raise HTTPException(status_code=503, detail="Token data not available yet")
     
-    return token_cache[:limit]
+    return tokens[:limit]
 
 @app.get("/tokens/{mint_address}/holders")
-async def get_token_holders(mint_address: str, limit: int = Query(50, le=100)):
+async def get_token_holders(request: Request, mint_address: str, limit: int = Query(50, le=100)):
     """Get token holders from BirdEye API"""
     if not mint_address or mint_address == "null":
         raise HTTPException(status_code=400, detail="Valid mint address required")
     
-    parser = DataParser()
-    holder_data = await parser.get_token_holders(mint_address, limit)
-    
-    if not holder_data:
-        raise HTTPException(status_code=404, detail="Holder data not available")
+    key = (mint_address, limit)
+    cached = holders_cache.get(key)
+    if cached and cached[0] > time.time():
+        _, body, etag = cached
+    else:
+        parser = app.state.parser
+        holder_data = await parser.get_token_holders(mint_address, limit)
+        
+        if not holder_data:
+            raise HTTPException(status_code=404, detail="Holder data not available")
+        
+        add_holder_display_fields(holder_data["holders"])
+        body = orjson.dumps(holder_data)
+        etag = make_etag(body)
+        cache_holders(key, body, etag)
     
-    return holder_data
+    headers = {"Cache-Control": f"public, max-age={settings.HOLDERS_CACHE_TTL}", "ETag": etag}
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 @app.get("/tokens/with-holders/json")
 async def get_tokens_with_holders_json(include_holders: bool = Query(False)):
     """Get token data as JSON with optional holder information"""
-    if not token_cache:
+    if not include_holders:
+        # Same document as /tokens/json - serve the cached bytes
+        raw, _, _ = await get_tokens_json_bytes()
+        if raw:
+            return Response(raw, media_type="application/json")
+    
+    snapshot = await get_token_snapshot()
+    if not snapshot:
         return {
             "last_updated": datetime.now().isoformat(),
             "total_tokens": 0,
@@ -1105,45 +677,31 @@ async def get_tokens_with_holders_json(include_holders: bool = Query(False)):
         }
     
     try:
-        tokens_data = []
-        parser = DataParser()
+        tokens_data = [dict(token) for token in snapshot["tokens"]]
+        parser = app.state.parser
+        semaphore = asyncio.Semaphore(settings.HOLDER_FETCH_CONCURRENCY)
         
-        for token in token_cache:
-            token_dict = token.model_dump() if hasattr(token, 'model_dump') else {
-                'rank': token.rank,
-                'name': token.name,
-                'symbol': token.symbol,
-                'mint_address': token.mint_address,
-                'market_cap': token.market_cap,
-                'volume_24h': token.volume_24h,
-                'price': token.price,
-                'price_change_24h': token.price_change_24h,
-                'solscan_url': token.solscan_url,
-                'coingecko_url': token.coingecko_url,
-                'birdeye_url': token.birdeye_url
-            }
-            
-            # Include holder data if requested and mint address exists
-            if include_holders and token.mint_address:
-                try:
-                    holder_data = await parser.get_token_holders(token.mint_address, limit=10)
-                    if holder_data:
-                        token_dict["top_holders"] = holder_data["holders"][:5]  # Top 5 holders
-                        token_dict["holder_stats"] = holder_data["stats"]
-                except Exception as e:
-                    logger.error(f"Error fetching holders for {token.symbol}: {str(e)}")
-                    token_dict["top_holders"] = []
-                    token_dict["holder_stats"] = {}
-            
-            tokens_data.append(token_dict)
+        async def fetch_holders(mint_address: str):
+            async with semaphore:
+                return await parser.get_token_holders(mint_address, limit=10)
         
-        return {
-            "last_updated": last_update.isoformat() if last_update else datetime.now().isoformat(),
-            "total_tokens": len(token_cache),
-            "total_market_cap": sum(token.market_cap for token in token_cache),
-            "total_volume_24h": sum(token.volume_24h for token in token_cache),
-            "tokens": tokens_data
-        }
+        # Fan out holder lookups concurrently (bounded for BirdEye rate limits)
+        with_mint = [token_dict for token_dict in tokens_data if token_dict.get('mint_address')]
+        results = await asyncio.gather(
+            *[fetch_holders(token_dict['mint_address']) for token_dict in with_mint],
+            return_exceptions=True
+        )
+        
+        for token_dict, holder_data in zip(with_mint, results):
+            if isinstance(holder_data, Exception):
+                logger.error(f"Error fetching holders for {token_dict.get('symbol')}: {str(holder_data)}")
+                token_dict["top_holders"] = []
+                token_dict["holder_stats"] = {}
+            elif holder_data:
+                token_dict["top_holders"] = add_holder_display_fields(holder_data["holders"][:5])  # Top 5 holders
+                token_dict["holder_stats"] = holder_data["stats"]
+        
+        return {**snapshot, "tokens": tokens_data}
         
     except Exception as e:
         logger.error(f"Error in /tokens/with-holders/json: {e}")
@@ -1152,42 +710,43 @@ async def get_tokens_with_holders_json(include_holders: bool = Query(False)):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    meta = await get_token_meta()
     return {
         "status": "healthy",
-        "last_update": last_update,
-        "tokens_cached": len(token_cache),
+        "last_update": meta.get("last_updated"),
+        "tokens_cached": meta.get("total_tokens", 0),
         "data_file_exists": os.path.exists(DATA_FILE),
         "update_interval": settings.UPDATE_INTERVAL
     }
 
 @app.get("/tokens/webhook-payload", response_model=WebhookPayload)
-async def get_webhook_payload():
+async def get_webhook_payload(request: Request):
     """Get the payload that would be sent to webhooks"""
-    if not token_cache:
-        raise HTTPException(status_code=503, detail="Token data not available yet")
+    # Built from the same snapshot as /tokens/json, so it shares that ETag
+    etag = await get_tokens_etag()
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     
-    totals = webhook_manager._calculate_totals(token_cache)
+    # Serialized by the update task - no model validation or encoding per request
+    payload = await get_webhook_payload_bytes()
+    if not payload:
+        raise HTTPException(status_code=503, detail="Token data not available yet")
     
-    return WebhookPayload(
-        timestamp=last_update or datetime.now(),
-        update_interval=settings.UPDATE_INTERVAL,
-        total_tokens=len(token_cache),
-        total_market_cap=totals["total_market_cap"],
-        total_volume_24h=totals["total_volume_24h"],
-        tokens=token_cache
-    )
+    headers = {"Cache-Control": await snapshot_cache_control(), "ETag": etag}
+    return Response(payload, media_type="application/json", headers=headers)
 
 @app.post("/webhooks/register", response_model=WebhookResponse)
 async def register_webhook(webhook_url: str):
     """Register a new webhook URL"""
-    success = webhook_manager.register_webhook(webhook_url)
+    success = await register_webhook_url(webhook_url)
     
     if success:
+        meta = await get_token_meta()
         return WebhookResponse(
             status="success",
             message="Webhook registered successfully",
-            tokens_count=len(token_cache),
-            last_updated=last_update or datetime.now()
+            tokens_count=meta.get("total_tokens", 0),
+            last_updated=meta.get("last_updated") or datetime.now()
         )
     else:
         raise HTTPException(status_code=400, detail="Webhook URL already registered")
@@ -1195,14 +754,15 @@ async def register_webhook(webhook_url: str):
 @app.delete("/webhooks/unregister", response_model=WebhookResponse)
 async def unregister_webhook(webhook_url: str):
     """Unregister a webhook URL"""
-    success = webhook_manager.unregister_webhook(webhook_url)
+    success = await unregister_webhook_url(webhook_url)
     
     if success:
+        meta = await get_token_meta()
         return WebhookResponse(
             status="success",
             message="Webhook unregistered successfully",
-            tokens_count=len(token_cache),
-            last_updated=last_update or datetime.now()
+            tokens_count=meta.get("total_tokens", 0),
+            last_updated=meta.get("last_updated") or datetime.now()
         )
     else:
         raise HTTPException(status_code=404, detail="Webhook URL not found")
@@ -1210,9 +770,10 @@ async def unregister_webhook(webhook_url: str):
 @app.get("/webhooks/list")
 async def list_webhooks():
     """List all registered webhook URLs"""
+    webhooks = await list_webhook_urls()
     return {
-        "webhooks": webhook_manager.get_registered_webhooks(),
-        "count": len(webhook_manager.get_registered_webhooks())
+        "webhooks": webhooks,
+        "count": len(webhooks)
     }
 
 if __name__ == "__main__":
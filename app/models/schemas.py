@@ -1,8 +1,12 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from functools import cached_property
 
 class TokenData(BaseModel):
+    # Immutable once fetched - the cached as_dict and lookup indexes rely on it
+    model_config = ConfigDict(frozen=True)
+    
     rank: int
     name: str
     symbol: str
@@ -16,6 +20,11 @@ class TokenData(BaseModel):
     coingecko_id: Optional[str] = None
     birdeye_url: Optional[str] = None
 
+    @cached_property
+    def as_dict(self) -> Dict[str, Any]:
+        """model_dump(mode="json") computed once per token - treat as read-only"""
+        return self.model_dump(mode="json")
+
 class WebhookPayload(BaseModel):
     timestamp: datetime
     update_interval: int = Field(..., description="Update interval in seconds")
@@ -1,24 +1,34 @@
 import aiohttp
 import asyncio
-import json
+import orjson
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+MARKETS_PAGE_SIZE = 250  # most ids /coins/markets accepts per page
+
 class CoinGeckoClient:
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.base_url = settings.COINGECKO_API_BASE
-        self.session = None
+        self.session = session
+        self._owns_session = False
+        # Last /coins/markets response per page size with its validators: (etag, last_modified, data)
+        self._markets_cache: Dict[int, Tuple[Optional[str], Optional[str], List[Dict[str, Any]]]] = {}
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Reuse the injected session; only open (and later close) one of our own without it
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+            self._owns_session = True
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
+            self.session = None
+            self._owns_session = False
 
     async def get_solana_tokens(self, per_page: int = 100) -> List[Dict[str, Any]]:
         """Get top Solana ecosystem tokens from CoinGecko API"""
@@ -36,9 +46,27 @@ class CoinGeckoClient:
             
             logger.info(f"Fetching tokens from CoinGecko with params: {params}")
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
+            # Conditional request - CoinGecko answers 304 with no body when the list is unchanged
+            headers = {}
+            cached = self._markets_cache.get(per_page)
+            if cached:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            
+            async with self.session.get(url, params=params, headers=headers) as response:
+                if response.status == 304 and cached:
+                    logger.info("CoinGecko markets not modified, reusing previous response")
+                    return cached[2]
+                elif response.status == 200:
+                    data = orjson.loads(await response.read())
+                    self._markets_cache[per_page] = (
+                        response.headers.get('ETag'),
+                        response.headers.get('Last-Modified'),
+                        data
+                    )
                     logger.info(f"Fetched {len(data)} tokens from CoinGecko")
                     return data
                 else:
@@ -50,6 +78,34 @@ class CoinGeckoClient:
             logger.error(f"Error fetching from CoinGecko: {str(e)}")
             return []
 
+    async def get_markets_by_ids(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get market data for many coins in batched /coins/markets calls instead of one get_token_info each"""
+        markets = []
+        for start in range(0, len(ids), MARKETS_PAGE_SIZE):
+            batch = ids[start:start + MARKETS_PAGE_SIZE]
+            try:
+                url = f"{self.base_url}/coins/markets"
+                params = {
+                    'vs_currency': 'usd',
+                    'ids': ','.join(batch),
+                    'per_page': len(batch),
+                    'page': 1,
+                    'sparkline': 'false',
+                    'price_change_percentage': '24h'
+                }
+                
+                async with self.session.get(url, params=params) as response:
+                    if response.status == 200:
+                        markets.extend(orjson.loads(await response.read()))
+                    else:
+                        error_text = await response.text()
+                        logger.error(f"CoinGecko API error: {response.status} - {error_text}")
+                        
+            except Exception as e:
+                logger.error(f"Error fetching markets for {len(batch)} coins from CoinGecko: {str(e)}")
+        
+        return markets
+
     async def get_token_info(self, coin_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific token"""
         try:
@@ -65,7 +121,7 @@ class CoinGeckoClient:
             
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return orjson.loads(await response.read())
                 return None
                 
         except Exception as e:
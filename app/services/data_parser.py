@@ -5,14 +5,23 @@ import os
 import time
 import json
 import pickle
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import random
+import re
+import sqlite3
+from bisect import bisect_right
+from collections import deque
+from contextlib import closing
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import orjson
 from dotenv import load_dotenv
 
 # Import your existing modules
 try:
     from app.models.schemas import TokenData
     from app.services.coingecko_client import CoinGeckoClient
+    from app.utils.helpers import create_http_session
 except ImportError:
     # Fallback for standalone testing
     from dataclasses import dataclass
@@ -32,65 +41,90 @@ except ImportError:
         birdeye_url: str
     
     class CoinGeckoClient:
+        def __init__(self, session=None):
+            self.session = session
+        
         async def get_solana_tokens(self, per_page: int = 100):
             # Mock implementation for testing
             return []
+    
+    def create_http_session():
+        return aiohttp.ClientSession()
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+BIRDEYE_LIST_PAGE_SIZE = 100  # most tokens /v3/token/list returns per request
+BIRDEYE_PREFETCH_PAGES = 5  # pages of the liquidity-sorted list indexed up front
+BIRDEYE_UNIVERSE_TTL = 3600  # seconds before the prefetched index is fetched again
+MINT_LOOKUP_CONCURRENCY = 8  # in-flight per-token mint searches (well under 35 requests/min)
+CACHE_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (coingecko_id TEXT PRIMARY KEY, rank INTEGER, json BLOB, updated_at REAL);
+CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v BLOB);
+"""
+CACHE_SOFT_TTL_RATIO = 0.75  # past this share of cache_ttl, serve the cache but refresh it in the background
+
 class EnhancedRateLimiter:
     """Enhanced rate limiter with exponential backoff"""
     def __init__(self, max_requests: int = 35, time_window: int = 60, max_retries: int = 3):
         self.max_requests = max_requests
         self.time_window = time_window
         self.max_retries = max_retries
-        self.requests = []
+        self.requests = deque()  # request times, oldest first
         self.lock = asyncio.Lock()
         self.retry_delays = [1, 5, 15]
     
     async def acquire(self):
+        # The loop's monotonic clock - same units as asyncio.sleep, immune to wall-clock jumps
+        loop = asyncio.get_running_loop()
         async with self.lock:
-            now = time.time()
-            self.requests = [req_time for req_time in self.requests 
-                           if now - req_time < self.time_window]
+            now = loop.time()
+            self._evict_expired(now)
             
             if len(self.requests) >= self.max_requests:
-                oldest_request = min(self.requests)
+                oldest_request = self.requests[0]
                 wait_time = self.time_window - (now - oldest_request) + 1
                 if wait_time > 0:
-                    logger.info(f"Rate limit approaching, waiting {wait_time:.2f}s")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"Rate limit approaching, waiting {wait_time:.2f}s")
                     await asyncio.sleep(wait_time)
-                    now = time.time()
-                    self.requests = [req_time for req_time in self.requests 
-                                   if now - req_time < self.time_window]
+                    now = loop.time()
+                    self._evict_expired(now)
             
             self.requests.append(now)
     
-    async def make_request_with_retry(self, session, url, headers, params=None, retry_count=0):
+    def _evict_expired(self, now: float):
+        """Drop request times that have left the window"""
+        while self.requests and now - self.requests[0] >= self.time_window:
+            self.requests.popleft()
+    
+    async def make_request_with_retry(self, session, url, headers, params=None):
         """Make request with exponential backoff retry logic"""
         try:
-            await self.acquire()
-            
-            async with session.get(url, headers=headers, params=params, timeout=30) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 429:
-                    if retry_count < self.max_retries:
-                        delay = self.retry_delays[retry_count]
-                        logger.warning(f"Rate limited, retrying in {delay}s (attempt {retry_count + 1})")
-                        await asyncio.sleep(delay)
-                        return await self.make_request_with_retry(session, url, headers, params, retry_count + 1)
+            for attempt in range(self.max_retries + 1):
+                # Every attempt, retries included, counts against the rate limit
+                await self.acquire()
+                
+                async with session.get(url, headers=headers, params=params, timeout=30) as response:
+                    if response.status == 200:
+                        return orjson.loads(await response.read())
+                    elif response.status == 429:
+                        if attempt < self.max_retries:
+                            delay = self.retry_delays[attempt] + random.uniform(0, 0.5)
+                            logger.warning(f"Rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                        else:
+                            logger.error(f"Max retries exceeded for {url}")
+                            return None
+                    elif response.status == 401:
+                        logger.error("API key invalid or missing")
+                        return {"error": "API key invalid"}
                     else:
-                        logger.error(f"Max retries exceeded for {url}")
+                        logger.error(f"API request failed with status {response.status}")
                         return None
-                elif response.status == 401:
-                    logger.error("API key invalid or missing")
-                    return {"error": "API key invalid"}
-                else:
-                    logger.error(f"API request failed with status {response.status}")
-                    return None
+                
+                # Back off outside the response context so the connection goes back to the pool
+                await asyncio.sleep(delay)
                     
         except asyncio.TimeoutError:
             logger.error(f"Request timeout for {url}")
@@ -100,14 +134,41 @@ class EnhancedRateLimiter:
             return None
 
 class DataParser:
-    def __init__(self, cache_file: str = "token_cache.pkl", cache_ttl: int = 3600):
-        self.coingecko_client = CoinGeckoClient()
+    def __init__(self, cache_file: str = "token_cache.sqlite", cache_ttl: int = 3600,
+                 session: Optional[aiohttp.ClientSession] = None):
+        self.session = session  # shared app session, not closed by the parser
+        self._own_session: Optional[aiohttp.ClientSession] = None
+        self.coingecko_client = CoinGeckoClient(session)
         self.birdeye_api_key = os.getenv("BIRDEYE_API_KEY", "").strip()
         self.birdeye_base_url = "https://public-api.birdeye.so/defi"
+        
+        # BirdEye headers never change for a parser - built once, shared (read-only) by every request
+        self._headers = {
+            "accept": "application/json",
+            "x-chain": "solana"
+        }
+        if self.birdeye_api_key:
+            self._headers["X-API-KEY"] = self.birdeye_api_key
         self.rate_limiter = EnhancedRateLimiter(max_requests=35, time_window=60)
         self.cache_file = cache_file
         self.cache_ttl = cache_ttl
         self.cache = self._load_cache()
+        self._refresh_task: Optional[asyncio.Task] = None  # in-flight background refresh, at most one
+        
+        # Bulk-fetched BirdEye token list, indexed by upper-cased symbol and name
+        self._symbol_index: Dict[str, str] = {}
+        self._name_index: Dict[str, str] = {}
+        self._universe_fetched_at = 0.0
+        self._lookup_semaphore = asyncio.Semaphore(MINT_LOOKUP_CONCURRENCY)
+        
+        # Popular-token fallback, fetched once and shared by every lookup in a refresh
+        self._popular_addresses: List[str] = []  # liquidity order
+        self._popular_symbol_index: Dict[str, int] = {}  # upper-cased symbol -> first position
+        self._popular_symbol_pattern: Optional[re.Pattern] = None  # alternation of every symbol
+        self._popular_names_text = ""  # upper-cased names, one per line
+        self._popular_name_starts: List[int] = []  # offset of each name in _popular_names_text
+        self._popular_fetched_at = 0.0
+        self._popular_lock = asyncio.Lock()
         
         # Known token addresses for major tokens
         self.known_token_addresses = {
@@ -133,39 +194,135 @@ class DataParser:
         else:
             logger.warning("BIRDEYE_API_KEY not found")
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """The injected session, or a pooled one created on first use and owned by this parser"""
+        if self.session is not None and not self.session.closed:
+            return self.session
+        if self._own_session is None or self._own_session.closed:
+            self._own_session = create_http_session()
+        return self._own_session
+
+    async def close(self):
+        """Close the session this parser opened itself (an injected one belongs to the caller)"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._own_session is not None and not self._own_session.closed:
+            await self._own_session.close()
+        self._own_session = None
+
     def _load_cache(self):
         """Load cache from file"""
         try:
             if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'rb') as f:
-                    cache = pickle.load(f)
-                    if datetime.now().timestamp() - cache.get('timestamp', 0) < self.cache_ttl:
-                        logger.info("Loaded valid cache from disk")
-                        return cache
-                    else:
-                        logger.info("Cache expired, will refresh")
+                cache = self._read_cache_db()
+            else:
+                cache = self._load_legacy_cache()
+            if cache and time.time() - cache.get('timestamp', 0) < self.cache_ttl:
+                logger.info("Loaded valid cache from disk")
+                return self._with_numeric_columns(cache)
+            elif cache:
+                logger.info("Cache expired, will refresh")
         except Exception as e:
             logger.warning(f"Failed to load cache: {str(e)}")
         return {'timestamp': 0, 'mint_mapping': {}, 'tokens': []}
     
-    def _save_cache(self):
+    @staticmethod
+    def _with_numeric_columns(cache: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep market cap / volume as contiguous float64 columns next to the token list"""
+        tokens = cache.get('tokens', [])
+        cache['market_cap_arr'] = np.fromiter((t.market_cap for t in tokens), dtype=np.float64, count=len(tokens))
+        cache['volume_arr'] = np.fromiter((t.volume_24h for t in tokens), dtype=np.float64, count=len(tokens))
+        return cache
+    
+    def _connect_cache_db(self) -> sqlite3.Connection:
+        """Open the SQLite cache (WAL, so readers never block the refresh that writes it)"""
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(CACHE_DB_SCHEMA)
+        return conn
+    
+    def _read_cache_db(self) -> Optional[Dict[str, Any]]:
+        """Read the last saved refresh; token rows are only loaded while it is within cache_ttl"""
+        with closing(self._connect_cache_db()) as conn:
+            meta = {k: orjson.loads(v) for k, v in conn.execute("SELECT k, v FROM meta")}
+            if 'timestamp' not in meta:
+                return None
+            cache = {'timestamp': meta['timestamp'], 'mint_mapping': meta.get('mint_mapping', {}), 'tokens': []}
+            if time.time() - cache['timestamp'] < self.cache_ttl:
+                rows = conn.execute(
+                    "SELECT json FROM tokens WHERE updated_at >= ? ORDER BY rank", (cache['timestamp'],)
+                )
+                cache['tokens'] = [TokenData(**orjson.loads(row)) for (row,) in rows]
+        return cache
+    
+    def _load_legacy_cache(self) -> Optional[Dict[str, Any]]:
+        """Read a cache written by the old JSON or pickle formats, if one is lying around"""
+        base = os.path.splitext(self.cache_file)[0]
+        if os.path.exists(base + ".json"):
+            with open(base + ".json", 'rb') as f:
+                cache = orjson.loads(f.read())
+            cache['tokens'] = [TokenData(**token) for token in cache.get('tokens', [])]
+        elif os.path.exists(base + ".pkl"):
+            with open(base + ".pkl", 'rb') as f:
+                cache = pickle.load(f)
+        else:
+            return None
+        logger.info(f"Migrating legacy cache {base} to {self.cache_file}")
+        return cache
+    
+    async def _save_cache(self):
         """Save cache to file"""
         try:
-            with open(self.cache_file, 'wb') as f:
-                pickle.dump(self.cache, f)
+            # Serialize on the loop (orjson is fast); only the SQLite write goes to a thread
+            timestamp = self.cache['timestamp']
+            rows = [
+                (
+                    token.coingecko_id,
+                    token.rank,
+                    orjson.dumps(token.model_dump() if hasattr(token, 'model_dump') else asdict(token)),
+                    timestamp
+                )
+                for token in self.cache['tokens']
+            ]
+            meta = [
+                ('timestamp', orjson.dumps(timestamp)),
+                ('mint_mapping', orjson.dumps(self.cache['mint_mapping'])),
+            ]
+            await asyncio.to_thread(self._write_cache_db, timestamp, rows, meta)
             logger.info("Cache saved to disk")
         except Exception as e:
             logger.warning(f"Failed to save cache: {str(e)}")
 
+    def _write_cache_db(self, timestamp: float, rows: List[Tuple], meta: List[Tuple[str, bytes]]):
+        """Blocking part of _save_cache - run in a worker thread"""
+        # One transaction: upsert this refresh's rows, drop tokens that fell out of the list
+        with closing(self._connect_cache_db()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO tokens (coingecko_id, rank, json, updated_at) VALUES (?, ?, ?, ?)", rows
+            )
+            conn.execute("DELETE FROM tokens WHERE updated_at < ?", (timestamp,))
+            conn.executemany("INSERT OR REPLACE INTO meta (k, v) VALUES (?, ?)", meta)
+
     async def get_top_tokens(self, limit: int = 100, use_cache: bool = True, force_refresh: bool = False) -> List[TokenData]:
         """Get top Solana tokens by parsing mint addresses from BirdEye API"""
         
         if use_cache and self._is_cache_valid() and not force_refresh:
+            if not self._is_cache_fresh() and self._refresh_task is None:
+                # Soft-expired: answer from the cache now and refresh it off the request path
+                self._refresh_task = asyncio.create_task(self._background_refresh(limit))
             logger.info("Using cached token data")
             return self.cache.get('tokens', [])
         
         tokens = []
         
+        # CoinGecko calls go over the same pooled session
+        self.coingecko_client.session = await self._get_session()
         async with self.coingecko_client as client:
             logger.info(f"Fetching top {limit} tokens from CoinGecko...")
             market_data = await client.get_solana_tokens(per_page=limit)
@@ -193,35 +350,75 @@ class DataParser:
         
         # Update cache
         if use_cache:
-            self.cache = {
-                'timestamp': datetime.now().timestamp(),
+            self.cache = self._with_numeric_columns({
+                'timestamp': time.time(),
                 'mint_mapping': {token.symbol: token.mint_address for token in tokens},
                 'tokens': tokens
-            }
-            self._save_cache()
+            })
+            await self._save_cache()
         
         return tokens
 
     def _is_cache_valid(self) -> bool:
         """Check if cache is still valid"""
-        return datetime.now().timestamp() - self.cache.get('timestamp', 0) < self.cache_ttl
+        return time.time() - self.cache.get('timestamp', 0) < self.cache_ttl
+
+    def _is_cache_fresh(self) -> bool:
+        """Check if cache is still inside its soft TTL (no background refresh needed)"""
+        return time.time() - self.cache.get('timestamp', 0) < self.cache_ttl * CACHE_SOFT_TTL_RATIO
+
+    async def _background_refresh(self, limit: int):
+        """Refresh the cache for a soft-expired read; callers keep getting the old tokens meanwhile"""
+        try:
+            logger.info("Cache soft-expired, refreshing in the background")
+            await self.get_top_tokens(limit=limit, use_cache=True, force_refresh=True)
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed: {str(e)}")
+        finally:
+            self._refresh_task = None
 
     async def _get_mint_addresses_from_birdeye(self, market_data: List[Dict[str, Any]]) -> Dict[str, str]:
         """Get mint addresses by searching BirdEye API for each token"""
-        mint_mapping = {}
+        # Known tokens resolve straight from the dict - only the rest need BirdEye
+        known = self.known_token_addresses
+        unknown_tokens = [t for t in market_data if t.get('symbol', '').upper() not in known]
+        mint_mapping = {
+            symbol: known[symbol]
+            for symbol in (t.get('symbol', '').upper() for t in market_data)
+            if symbol in known
+        }
+        logger.info(f"Resolved {len(mint_mapping)} known mint addresses, searching for {len(unknown_tokens)}")
+        if not unknown_tokens:
+            return mint_mapping
         
-        for token_data in market_data:
+        # One bulk list fetch resolves most tokens without per-token searches
+        await self._prefetch_birdeye_universe()
+        
+        async def bounded_find(token_data: Dict[str, Any]) -> Tuple[str, Optional[str]]:
             symbol = token_data.get('symbol', '').upper()
             name = token_data.get('name', '')
+            async with self._lookup_semaphore:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Searching for mint address: {symbol} ({name})")
+                
+                # Try multiple methods to find mint address
+                return symbol, await self._find_mint_address(symbol, name)
+        
+        # Lookups are independent - run them concurrently, capped below the rate limiter's budget
+        results = await asyncio.gather(*[bounded_find(token_data) for token_data in unknown_tokens], return_exceptions=True)
+        
+        log_info = logger.isEnabledFor(logging.INFO)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Mint address lookup failed: {str(result)}")
+                continue
             
-            logger.info(f"Searching for mint address: {symbol} ({name})")
-            
-            # Try multiple methods to find mint address
-            mint_address = await self._find_mint_address(symbol, name)
+            symbol, mint_address = result
             mint_mapping[symbol] = mint_address
             
             if mint_address:
-                logger.info(f"✅ Found mint address for {symbol}: {mint_address[:8]}...")
+                if log_info:
+                    logger.info(f"✅ Found mint address for {symbol}: {mint_address[:8]}...")
             else:
                 logger.warning(f"❌ No mint address found for {symbol}")
         
@@ -234,29 +431,121 @@ class DataParser:
         if symbol in self.known_token_addresses:
             return self.known_token_addresses[symbol]
         
-        # Method 2: Search BirdEye token list by symbol
+        # Method 2: Look up the prefetched BirdEye token list
+        mint_address = self._symbol_index.get(symbol) or (name and self._name_index.get(name.upper()))
+        if mint_address:
+            return mint_address
+        
+        # Method 3: Search BirdEye token list by symbol
         mint_address = await self._search_birdeye_by_symbol(symbol)
         if mint_address:
             return mint_address
         
-        # Method 3: Search BirdEye token list by name
-        if name:
+        # Method 4: Search BirdEye token list by name (pointless when it is just the symbol again)
+        if name and name.upper() != symbol:
             mint_address = await self._search_birdeye_by_name(name)
             if mint_address:
                 return mint_address
         
-        # Method 4: Get token metadata from popular tokens and try to match
-        popular_tokens = await self._get_popular_tokens()
-        for token in popular_tokens:
-            token_symbol = token.get("symbol", "").upper()
-            token_name = token.get("name", "").upper()
-            
-            if (token_symbol == symbol or 
-                symbol in token_name or 
-                token_symbol in name):
-                return token.get("address")
+        # Method 5: Get token metadata from popular tokens and try to match
+        await self._load_popular_tokens()
+        return self._match_popular_token(symbol, name)
+
+    def _match_popular_token(self, symbol: str, name: str) -> Optional[str]:
+        """Most liquid popular token whose symbol is ours, whose name contains our symbol, or whose symbol is in our name"""
+        if not self._popular_addresses:
+            return None
+        
+        index = self._popular_symbol_index.get(symbol)
+        if index is not None:
+            return self._popular_addresses[index]
         
-        return None
+        candidates = []
+        # One scan over all names instead of a substring check per popular token
+        position = self._popular_names_text.find(symbol)
+        if position >= 0:
+            candidates.append(bisect_right(self._popular_name_starts, position) - 1)
+        # One regex pass over our name (original case, as before) for every popular symbol at once
+        if self._popular_symbol_pattern is not None and name:
+            candidates.extend(
+                self._popular_symbol_index[match]
+                for match in self._popular_symbol_pattern.findall(name)
+            )
+        
+        return self._popular_addresses[min(candidates)] if candidates else None
+
+    async def _load_popular_tokens(self) -> None:
+        """Fetch the popular tokens once per BIRDEYE_UNIVERSE_TTL and index them for _find_mint_address"""
+        async with self._popular_lock:
+            if time.time() - self._popular_fetched_at < BIRDEYE_UNIVERSE_TTL:
+                return
+            
+            popular_tokens = await self._get_popular_tokens()
+            symbol_index: Dict[str, int] = {}
+            names = []
+            for index, token in enumerate(popular_tokens):
+                if token["symbol"]:
+                    symbol_index.setdefault(token["symbol"].upper(), index)
+                names.append(token["name"].upper().replace("\n", " "))
+            
+            name_starts = []
+            offset = 0
+            for token_name in names:
+                name_starts.append(offset)
+                offset += len(token_name) + 1
+            
+            self._popular_addresses = [token["address"] for token in popular_tokens]
+            self._popular_symbol_index = symbol_index
+            # Zero-width lookahead finds overlapping matches ("BTC" inside "WBTC"); alternatives in
+            # liquidity order so each position reports its most liquid symbol
+            self._popular_symbol_pattern = re.compile(
+                "(?=(" + "|".join(map(re.escape, symbol_index)) + "))"
+            ) if symbol_index else None
+            self._popular_names_text = "\n".join(names)
+            self._popular_name_starts = name_starts
+            if popular_tokens:
+                self._popular_fetched_at = time.time()
+
+    async def _prefetch_birdeye_universe(self, pages: int = BIRDEYE_PREFETCH_PAGES) -> None:
+        """Fetch the top of BirdEye's token list in concurrent pages and index it by symbol and name"""
+        if not self.birdeye_api_key or time.time() - self._universe_fetched_at < BIRDEYE_UNIVERSE_TTL:
+            return
+        
+        url = f"{self.birdeye_base_url}/v3/token/list"
+        headers = self._headers
+        session = await self._get_session()
+        
+        responses = await asyncio.gather(*[
+            self.rate_limiter.make_request_with_retry(session, url, headers, {
+                "sort_by": "liquidity",
+                "sort_type": "desc",
+                "offset": page * BIRDEYE_LIST_PAGE_SIZE,
+                "limit": BIRDEYE_LIST_PAGE_SIZE
+            })
+            for page in range(pages)
+        ], return_exceptions=True)
+        
+        symbol_index = {}
+        name_index = {}
+        for data in responses:
+            if isinstance(data, dict) and data.get("success") and "items" in data.get("data", {}):
+                # Pages are in liquidity order, so the most liquid token keeps a shared symbol/name
+                for item in data["data"]["items"]:
+                    address = item.get("address")
+                    if not address:
+                        continue
+                    if item.get("symbol"):
+                        symbol_index.setdefault(item["symbol"].upper(), address)
+                    if item.get("name"):
+                        name_index.setdefault(item["name"].upper(), address)
+        
+        if symbol_index:
+            self._symbol_index = symbol_index
+            self._name_index = name_index
+            self._universe_fetched_at = time.time()
+            logger.info(f"Indexed {len(symbol_index)} BirdEye tokens for mint lookups")
+        else:
+            logger.warning("BirdEye token list prefetch returned nothing, falling back to per-token search")
 
     async def _search_birdeye_by_symbol(self, symbol: str) -> Optional[str]:
         """Search BirdEye token list by symbol"""
@@ -273,30 +562,30 @@ class DataParser:
                 "search": symbol
             }
             
-            headers = self._get_headers()
+            headers = self._headers
             
-            async with aiohttp.ClientSession() as session:
-                data = await self.rate_limiter.make_request_with_retry(session, url, headers, params)
+            session = await self._get_session()
+            data = await self.rate_limiter.make_request_with_retry(session, url, headers, params)
+            
+            if data and data.get("success") and "data" in data and "items" in data["data"]:
+                items = data["data"]["items"]
                 
-                if data and data.get("success") and "data" in data and "items" in data["data"]:
-                    items = data["data"]["items"]
-                    
-                    # Try exact symbol match first
-                    for item in items:
-                        item_symbol = item.get("symbol", "").upper()
-                        if item_symbol == symbol:
-                            address = item.get("address")
-                            if address:
-                                return address
-                    
-                    # Try any match if no exact symbol match
-                    if items:
-                        address = items[0].get("address")
+                # Try exact symbol match first
+                for item in items:
+                    item_symbol = item.get("symbol", "").upper()
+                    if item_symbol == symbol:
+                        address = item.get("address")
                         if address:
                             return address
                 
-                return None
-                    
+                # Try any match if no exact symbol match
+                if items:
+                    address = items[0].get("address")
+                    if address:
+                        return address
+            
+            return None
+                
         except Exception as e:
             logger.error(f"Error searching for {symbol}: {str(e)}")
             return None
@@ -316,20 +605,20 @@ class DataParser:
                 "search": name
             }
             
-            headers = self._get_headers()
+            headers = self._headers
             
-            async with aiohttp.ClientSession() as session:
-                data = await self.rate_limiter.make_request_with_retry(session, url, headers, params)
-                
-                if data and data.get("success") and "data" in data and "items" in data["data"]:
-                    items = data["data"]["items"]
-                    if items:
-                        address = items[0].get("address")
-                        if address:
-                            return address
+            session = await self._get_session()
+            data = await self.rate_limiter.make_request_with_retry(session, url, headers, params)
+            
+            if data and data.get("success") and "data" in data and "items" in data["data"]:
+                items = data["data"]["items"]
+                if items:
+                    address = items[0].get("address")
+                    if address:
+                        return address
+            
+            return None
                 
-                return None
-                    
         except Exception as e:
             logger.error(f"Error searching for {name}: {str(e)}")
             return None
@@ -348,27 +637,27 @@ class DataParser:
                 "limit": 50  # Get top 50 tokens by liquidity
             }
             
-            headers = self._get_headers()
+            headers = self._headers
+            
+            session = await self._get_session()
+            data = await self.rate_limiter.make_request_with_retry(session, url, headers, params)
             
-            async with aiohttp.ClientSession() as session:
-                data = await self.rate_limiter.make_request_with_retry(session, url, headers, params)
+            if data and data.get("success") and "data" in data and "items" in data["data"]:
+                items = data["data"]["items"]
+                tokens = []
+                
+                for item in items:
+                    tokens.append({
+                        "address": item.get("address"),
+                        "symbol": item.get("symbol", ""),
+                        "name": item.get("name", "")
+                    })
+                
+                logger.info(f"Fetched {len(tokens)} popular tokens from BirdEye")
+                return tokens
+            else:
+                return []
                 
-                if data and data.get("success") and "data" in data and "items" in data["data"]:
-                    items = data["data"]["items"]
-                    tokens = []
-                    
-                    for item in items:
-                        tokens.append({
-                            "address": item.get("address"),
-                            "symbol": item.get("symbol", ""),
-                            "name": item.get("name", "")
-                        })
-                    
-                    logger.info(f"Fetched {len(tokens)} popular tokens from BirdEye")
-                    return tokens
-                else:
-                    return []
-                    
         except Exception as e:
             logger.error(f"Error fetching popular tokens: {str(e)}")
             return []
@@ -382,31 +671,23 @@ class DataParser:
             url = f"{self.birdeye_base_url}/v3/token/meta"
             params = {"address": mint_address}
             
-            headers = self._get_headers()
+            headers = self._headers
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("success") and "data" in data:
-                            return data["data"]
-                    return None
-                    
+            session = await self._get_session()
+            async with session.get(url, params=params, headers=headers, timeout=10) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    if data.get("success") and "data" in data:
+                        return data["data"]
+                return None
+                
         except Exception as e:
             logger.error(f"Error fetching metadata for {mint_address[:8]}: {str(e)}")
             return None
 
     def _get_headers(self) -> Dict[str, str]:
         """Get the correct headers for BirdEye API"""
-        headers = {
-            "accept": "application/json",
-            "x-chain": "solana"
-        }
-        
-        if self.birdeye_api_key:
-            headers["X-API-KEY"] = self.birdeye_api_key
-            
-        return headers
+        return self._headers
 
     async def _parse_token_data_with_mint(self, data: Dict[str, Any], rank: int, mint_mapping: Dict[str, str]) -> Optional[TokenData]:
         """Parse token data with mint address"""
@@ -465,12 +746,15 @@ class DataParser:
         if not tokens:
             return {"total_market_cap": 0, "total_volume_24h": 0}
             
-        total_market_cap = sum(token.market_cap for token in tokens)
-        total_volume = sum(token.volume_24h for token in tokens)
+        # Reuse the cached columns for the cached list, otherwise build them once
+        if tokens is self.cache.get('tokens') and 'market_cap_arr' in self.cache:
+            columns = self.cache
+        else:
+            columns = self._with_numeric_columns({'tokens': tokens})
         
         return {
-            "total_market_cap": total_market_cap,
-            "total_volume_24h": total_volume
+            "total_market_cap": float(columns['market_cap_arr'].sum()),
+            "total_volume_24h": float(columns['volume_arr'].sum())
         }
 
     def clear_cache(self):
@@ -480,6 +764,10 @@ class DataParser:
             if os.path.exists(self.cache_file):
                 os.remove(self.cache_file)
                 logger.info("Cache cleared")
+            # WAL side files belong to the database that was just removed
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(self.cache_file + suffix):
+                    os.remove(self.cache_file + suffix)
         except Exception as e:
             logger.warning(f"Error clearing cache file: {str(e)}")
 
@@ -505,17 +793,17 @@ class DataParser:
                 "ui_amount_mode": "scaled"
             }
             
-            headers = self._get_headers()
+            headers = self._headers
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data and data.get("success") and "data" in data and "items" in data["data"]:
-                            return self._process_holder_data(data["data"]["items"])
-                    
-                    return None
-                    
+            session = await self._get_session()
+            async with session.get(url, headers=headers, params=params, timeout=30) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    if data and data.get("success") and "data" in data and "items" in data["data"]:
+                        return self._process_holder_data(data["data"]["items"])
+                
+                return None
+                
         except Exception as e:
             logger.error(f"Error fetching holders for {mint_address[:8]}: {str(e)}")
             return None
@@ -525,35 +813,34 @@ class DataParser:
         if not items:
             return {"holders": [], "stats": {}}
         
-        holders = []
-        total_supply = 0
+        # Vectorize the balances once for the sum, max and percentages
+        amounts = np.fromiter((item.get("ui_amount", 0) for item in items), dtype=np.float64, count=len(items))
+        total_supply = float(amounts.sum())
+        if total_supply > 0:
+            percentages = (amounts * (100.0 / total_supply)).tolist()
+        else:
+            percentages = [0] * len(items)
         
-        for item in items:
-            holder_data = {
+        holders = [
+            {
                 "owner": item.get("owner"),
                 "ui_amount": item.get("ui_amount", 0),
                 "amount": item.get("amount", "0"),
                 "decimals": item.get("decimals", 0),
-                "token_account": item.get("token_account")
+                "token_account": item.get("token_account"),
+                "percentage": percentage
             }
-            holders.append(holder_data)
-            total_supply += holder_data["ui_amount"]
+            for item, percentage in zip(items, percentages)
+        ]
         
         # Calculate statistics
         stats = {
             "total_holders": len(holders),
             "total_supply": total_supply,
-            "largest_balance": max([h["ui_amount"] for h in holders]) if holders else 0,
-            "average_balance": total_supply / len(holders) if holders else 0,
+            "largest_balance": float(amounts.max()),
+            "average_balance": total_supply / len(holders),
         }
         
-        # Calculate percentages
-        for holder in holders:
-            if total_supply > 0:
-                holder["percentage"] = (holder["ui_amount"] / total_supply) * 100
-            else:
-                holder["percentage"] = 0
-        
         return {
             "holders": holders,
             "stats": stats
@@ -602,7 +889,10 @@ async def test_mint_parsing():
     print("Testing mint address parsing from BirdEye API...")
     
     # Test with force refresh to bypass cache
-    tokens = await parser.get_top_tokens(limit=10, force_refresh=True)
+    try:
+        tokens = await parser.get_top_tokens(limit=10, force_refresh=True)
+    finally:
+        await parser.close()
     
     print(f"Found {len(tokens)} tokens:")
     for token in tokens:
@@ -1,39 +1,108 @@
 import asyncio
 import aiohttp
 import logging
-from typing import List, Dict, Any
+import orjson
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-async def send_webhook(url: str, payload: Dict[str, Any], timeout: int = 30) -> bool:
-    """Send data to webhook URL"""
+def create_http_session() -> aiohttp.ClientSession:
+    """Process-wide HTTP session with a pooled, keep-alive connector - close it on shutdown"""
+    connector = aiohttp.TCPConnector(
+        limit=settings.HTTP_POOL_SIZE,
+        limit_per_host=settings.HTTP_POOL_PER_HOST,
+        ttl_dns_cache=300,
+        keepalive_timeout=60
+    )
+    # orjson for any json= request bodies; responses are decoded with orjson.loads at the call sites
+    return aiohttp.ClientSession(connector=connector, json_serialize=lambda obj: orjson.dumps(obj).decode())
+
+async def send_webhook(session: aiohttp.ClientSession, url: str, payload: Union[Dict[str, Any], bytes],
+                       timeout: int = 30) -> bool:
+    """Send data to webhook URL over the given (pooled) session; bytes payloads are sent as-is"""
+    body = payload if isinstance(payload, bytes) else orjson.dumps(payload)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url, 
-                json=payload, 
-                timeout=timeout,
-                headers={'Content-Type': 'application/json'}
-            ) as response:
-                if response.status in [200, 201, 202]:
-                    logger.info(f"Webhook sent successfully to {url}")
-                    return True
-                else:
-                    logger.error(f"Webhook failed with status {response.status} for {url}")
-                    return False
+        async with session.post(
+            url, 
+            data=body, 
+            timeout=timeout,
+            headers={'Content-Type': 'application/json'}
+        ) as response:
+            if response.status in [200, 201, 202]:
+                logger.info(f"Webhook sent successfully to {url}")
+                return True
+            else:
+                logger.error(f"Webhook failed with status {response.status} for {url}")
+                return False
     except Exception as e:
         logger.error(f"Error sending webhook to {url}: {str(e)}")
         return False
 
-async def retry_operation(operation, max_retries: int = 3, delay: float = 1.0):
-    """Retry an operation with exponential backoff"""
+async def retry_operation(operation, *args, max_retries: int = 3, delay: float = 1.0):
+    """Retry operation(*args) with exponential backoff"""
     for attempt in range(max_retries):
         try:
-            return await operation()
+            return await operation(*args)
         except Exception as e:
             if attempt == max_retries - 1:
                 raise e
             wait_time = delay * (2 ** attempt)
             logger.warning(f"Operation failed, retrying in {wait_time}s: {str(e)}")
-            await asyncio.sleep(wait_time)
\ No newline at end of file
+            await asyncio.sleep(wait_time)
+
+def format_number(num: Optional[float]) -> str:
+    """Format a large number with K/M/B suffix (mirrors formatNumber in the UI)"""
+    if num is None:
+        return 'N/A'
+    if num >= 1e9:
+        return f"{num / 1e9:.2f}B"
+    if num >= 1e6:
+        return f"{num / 1e6:.2f}M"
+    if num >= 1e3:
+        return f"{num / 1e3:.2f}K"
+    return f"{num:.2f}"
+
+def format_price(price: Optional[float]) -> str:
+    """Format a USD price with precision based on magnitude (mirrors formatPrice in the UI)"""
+    if price is None:
+        return 'N/A'
+    if price >= 1000:
+        return f"${price:.0f}"
+    if price >= 1:
+        return f"${price:.2f}"
+    if price >= 0.01:
+        return f"${price:.4f}"
+    if price >= 0.0001:
+        return f"${price:.6f}"
+    return f"${price:.8f}"
+
+def format_contract_address(address: Optional[str]) -> str:
+    """Shorten a mint address for display (mirrors formatContractAddress in the UI)"""
+    if not address:
+        return 'N/A'
+    if address == 'native':
+        return 'Native SOL'
+    if len(address) <= 16:
+        return address
+    return address[:8] + '...' + address[-8:]
+
+def format_wallet_address(address: Optional[str]) -> str:
+    """Shorten a wallet address for display, e.g. in holder rows"""
+    if not address:
+        return 'N/A'
+    return address[:6] + '...' + address[-4:]
+
+def add_holder_display_fields(holders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add the pre-formatted strings the UI renders for each holder row (in place)"""
+    for holder in holders:
+        owner = holder.get("owner")
+        percentage = holder.get("percentage") or 0
+        holder["owner_short"] = format_wallet_address(owner)
+        holder["balance_fmt"] = format_number(holder.get("ui_amount") or 0)
+        holder["percentage_fmt"] = f"{percentage:.4f}%"
+        holder["percentage_bar"] = min(percentage * 2, 100)
+        holder["solscan_url"] = f"https://solscan.io/account/{owner}"
+        holder["birdeye_url"] = f"https://birdeye.so/address/{owner}?chain=solana"
+    return holders
@@ -1,9 +1,11 @@
 import asyncio
+import aiohttp
 import logging
-from typing import List, Dict, Any, Set
+import orjson
+from typing import List, Dict, Any, Set, Optional
 from datetime import datetime
-from app.models.schemas import WebhookPayload, TokenData
-from app.utils.helpers import send_webhook, retry_operation
+from app.config import settings
+from app.utils.helpers import create_http_session, send_webhook, retry_operation
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +13,26 @@ class WebhookManager:
     def __init__(self):
         self.registered_webhooks: Set[str] = set()
         self.last_sent_data: Dict[str, Any] = {}
+        self.session: Optional[aiohttp.ClientSession] = None  # created on first send, see close()
+        self._broadcast_sem = asyncio.Semaphore(settings.WEBHOOK_CONCURRENCY)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """One pooled session for every webhook delivery"""
+        if self.session is None or self.session.closed:
+            self.session = create_http_session()
+        return self.session
+
+    async def close(self):
+        """Close the delivery session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
 
     def register_webhook(self, url: str) -> bool:
         """Register a new webhook URL"""
@@ -34,29 +56,46 @@ class WebhookManager:
         """Get all registered webhook URLs"""
         return list(self.registered_webhooks)
 
-    async def broadcast_update(self, tokens: List[TokenData], update_interval: int) -> Dict[str, Any]:
-        """Broadcast token data to all registered webhooks"""
-        if not self.registered_webhooks:
+    async def broadcast_update(self, tokens: List[Dict[str, Any]], update_interval: int,
+                               totals: Optional[Dict[str, float]] = None,
+                               tokens_json: Optional[bytes] = None) -> Dict[str, Any]:
+        """Broadcast token data (already dumped to dicts) to all registered webhooks.
+        tokens_json, when given, is orjson.dumps(tokens) and is spliced into the body as-is"""
+        # Snapshot the URLs - (un)registering during the fan-out must not change what this broadcast sends to
+        urls = tuple(self.registered_webhooks)
+        if not urls:
             logger.info("No webhooks registered, skipping broadcast")
             return {"sent": 0, "failed": 0}
 
-        # Prepare payload
-        totals = self._calculate_totals(tokens)
-        payload = WebhookPayload(
-            timestamp=datetime.now(),
-            update_interval=update_interval,
-            total_tokens=len(tokens),
-            total_market_cap=totals["total_market_cap"],
-            total_volume_24h=totals["total_volume_24h"],
-            tokens=tokens
-        )
+        # Build the WebhookPayload-shaped dict directly - the tokens were validated when fetched
+        if totals is None:
+            # Callers normally pass the refresh-time totals; otherwise add both up in one pass
+            total_market_cap = total_volume = 0.0
+            for token in tokens:
+                total_market_cap += token["market_cap"]
+                total_volume += token["volume_24h"]
+            totals = {"total_market_cap": total_market_cap, "total_volume_24h": total_volume}
 
-        # Convert to dict for JSON serialization
-        payload_dict = payload.model_dump()
+        payload_dict = {
+            "timestamp": datetime.now().isoformat(),
+            "update_interval": update_interval,
+            "total_tokens": len(tokens),
+            "total_market_cap": totals["total_market_cap"],
+            "total_volume_24h": totals["total_volume_24h"],
+            "tokens": tokens
+        }
+
+        # Serialize once - every webhook gets the same bytes
+        if tokens_json is None:
+            body = orjson.dumps(payload_dict)
+        else:
+            # The token list is already serialized - only encode the small envelope around it
+            envelope = orjson.dumps({key: value for key, value in payload_dict.items() if key != "tokens"})
+            body = envelope[:-1] + b',"tokens":' + tokens_json + b"}"
 
         # Send to all webhooks
         results = await asyncio.gather(
-            *[self._send_to_webhook(url, payload_dict) for url in self.registered_webhooks],
+            *[self._send_to_webhook(url, body) for url in urls],
             return_exceptions=True
         )
 
@@ -74,23 +113,16 @@ class WebhookManager:
 
         return {"sent": successful, "failed": failed}
 
-    def _calculate_totals(self, tokens: List[TokenData]) -> Dict[str, float]:
-        """Calculate total market cap and volume"""
-        total_market_cap = sum(token.market_cap for token in tokens)
-        total_volume = sum(token.volume_24h for token in tokens)
-        
-        return {
-            "total_market_cap": total_market_cap,
-            "total_volume_24h": total_volume
-        }
-
-    async def _send_to_webhook(self, url: str, payload: Dict[str, Any]) -> bool:
-        """Send data to a specific webhook with retry logic"""
-        async def send_operation():
-            return await send_webhook(url, payload)
-        
+    async def _send_to_webhook(self, url: str, body: bytes) -> bool:
+        """Send a pre-serialized payload to a specific webhook with retry logic"""
+        session = await self._get_session()
         try:
-            return await retry_operation(send_operation, max_retries=3, delay=2.0)
+            # Bounded fan-out so a long webhook list doesn't drain the connection pool at once
+            async with self._broadcast_sem:
+                return await retry_operation(
+                    send_webhook, session, url, body, settings.WEBHOOK_TIMEOUT,
+                    max_retries=settings.MAX_WEBHOOK_RETRIES, delay=2.0
+                )
         except Exception as e:
             logger.error(f"Failed to send webhook to {url} after retries: {str(e)}")
             return False
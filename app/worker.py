@@ -0,0 +1,25 @@
+import asyncio
+import logging
+
+from app.main import update_token_data, redis_client
+from app.services.data_parser import DataParser
+from app.webhooks.handlers import webhook_manager
+
+logger = logging.getLogger(__name__)
+
+async def run_worker():
+    """Run the token update loop on its own, publishing snapshots to Redis for the API workers"""
+    if redis_client is None:
+        logger.warning("REDIS_URL is not set - API workers will not see updates from this process")
+    
+    parser = DataParser()  # owns its pooled session
+    try:
+        async with webhook_manager:
+            await update_token_data(parser)
+    finally:
+        await parser.close()
+        if redis_client is not None:
+            await redis_client.aclose()
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())